@@ -1,316 +1,612 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import and_, or_, bindparam, delete, insert, select, text
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+from sqlalchemy.engine import Row
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 import logging
+import orjson
+import threading
 from app import models, schemas
+from app.ids import sequential_uuid
 
 logger = logging.getLogger(__name__)
 
+# SQL Server accepts at most 2100 parameters per statement
+ID_BATCH_SIZE = 2000
+
+def _query_in_batches(db: Session, model, column, values: Iterable) -> List:
+    values = list(dict.fromkeys(values))
+    result = []
+    for start in range(0, len(values), ID_BATCH_SIZE):
+        batch = values[start:start + ID_BATCH_SIZE]
+        result.extend(db.query(model).filter(column.in_(batch)).all())
+    return result
+
+def _get_by_ids(db: Session, model, pk_column, ids: Iterable[UUID]) -> Dict[UUID, object]:
+    return {getattr(obj, pk_column.key): obj for obj in _query_in_batches(db, model, pk_column, ids)}
+
+def _bulk_create(db: Session, model, pk_column, items: Iterable) -> List[UUID]:
+    # Keys and insert timestamps are generated here so the executemany INSERT needs no OUTPUT round-trip per row;
+    # the engine pages the rows via insertmanyvalues_page_size
+    stamps = models.insert_timestamps(model)
+    rows = [{pk_column.key: sequential_uuid(), **stamps, **item.model_dump()} for item in items]
+    if rows:
+        db.execute(insert(model), rows)
+    db.commit()
+    return [row[pk_column.key] for row in rows]
+
+# List endpoints: rows are serialized to JSON by SQL Server (FOR JSON PATH) and passed through as is
+_LIST_JSON_SQL = {}
+
+def _json_column(column) -> str:
+    # FOR JSON renders GUIDs upper-case; keep the lower-case form the API returns elsewhere
+    if isinstance(column.type, UNIQUEIDENTIFIER):
+        return f"LOWER(CONVERT(char(36), [{column.name}])) AS [{column.name}]"
+    return f"[{column.name}]"
+
+def _get_list_json(db: Session, model, skip: int, limit: int, after=None) -> str:
+    # after: keyset pagination, the page starts right after this primary key value
+    # (an index seek instead of OFFSET reading and discarding the skipped rows)
+    table = model.__table__
+    keyset = after is not None
+    sql = _LIST_JSON_SQL.get((table.name, keyset))
+    if sql is None:
+        columns = ", ".join(_json_column(column) for column in table.columns)
+        pk_columns = list(table.primary_key.columns)
+        order_by = ", ".join(f"[{column.name}]" for column in pk_columns)
+        where = f"WHERE [{pk_columns[0].name}] > :after " if keyset else ""
+        sql = text(
+            f"SELECT {columns} FROM [{table.name}] {where}ORDER BY {order_by} "
+            "OFFSET :skip ROWS FETCH NEXT :limit ROWS ONLY FOR JSON PATH, INCLUDE_NULL_VALUES"
+        )
+        if keyset:
+            sql = sql.bindparams(bindparam("after", type_=pk_columns[0].type))
+        _LIST_JSON_SQL[(table.name, keyset)] = sql
+    params = {"skip": skip, "limit": limit}
+    if keyset:
+        params["after"] = after
+    # Long FOR JSON output comes back split across several rows
+    chunks = db.execute(sql, params).scalars()
+    return "".join(chunk for chunk in chunks if chunk) or "[]"
+
+def _get_page_json(db: Session, model, cursor: Optional[UUID], limit: int) -> str:
+    # Cursor pages: {"items": [...], "next_cursor": ...}; next_cursor is the key of the page's last row,
+    # taken from the page itself so it always matches the returned items, or null when the page is not full
+    items = _get_list_json(db, model, 0, limit, cursor)
+    rows = orjson.loads(items)
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = rows[-1][model.__table__.primary_key.columns[0].name]
+    next_json = f'"{next_cursor}"' if next_cursor is not None else "null"
+    return f'{{"items":{items},"next_cursor":{next_json}}}'
+
+# Plain list reads: Core rows straight from the table, no ORM instances or identity map entries.
+# OFFSET needs an ORDER BY on SQL Server, the primary key keeps pages stable
+def _get_list_rows(db: Session, model, skip: int, limit: int) -> List[Row]:
+    table = model.__table__
+    stmt = select(table).order_by(*table.primary_key.columns).offset(skip).limit(limit)
+    return db.execute(stmt).all()
+
+# Eager loading for the *WithDetails responses: many-to-one via JOIN, collections via one extra SELECT ... IN.
+# raiseload('*') makes any relationship not listed here fail loudly instead of lazy loading row by row
+PASSENGER_DETAILS = (selectinload(models.Passenger.documents), raiseload('*'))
+FLIGHT_DETAILS = (selectinload(models.Flight.fares), raiseload('*'))
+BOOKING_DETAILS = (
+    joinedload(models.Booking.booking_status),
+    selectinload(models.Booking.tickets),
+    selectinload(models.Booking.payments),
+    raiseload('*'),
+)
+FARE_DETAILS = (joinedload(models.Fare.flight), raiseload('*'))
+TICKET_DETAILS = (
+    joinedload(models.Ticket.passenger),
+    joinedload(models.Ticket.booking),
+    joinedload(models.Ticket.fare),
+    joinedload(models.Ticket.passenger_document),
+    raiseload('*'),
+)
+
+# Primary key lookups are built once with a named bind parameter, so the compiled SQL is reused from
+# the engine's statement cache and only the id changes between calls
+def _select_by_pk(model, pk_column, *options):
+    return select(model).options(*options).where(pk_column == bindparam("pk"))
+
+PASSENGER_BY_ID = _select_by_pk(models.Passenger, models.Passenger.passenger_id)
+PASSENGER_DETAILS_BY_ID = _select_by_pk(models.Passenger, models.Passenger.passenger_id, *PASSENGER_DETAILS)
+FLIGHT_BY_ID = _select_by_pk(models.Flight, models.Flight.flight_id)
+FLIGHT_DETAILS_BY_ID = _select_by_pk(models.Flight, models.Flight.flight_id, *FLIGHT_DETAILS)
+BOOKING_BY_ID = _select_by_pk(models.Booking, models.Booking.booking_id)
+BOOKING_DETAILS_BY_ID = _select_by_pk(models.Booking, models.Booking.booking_id, *BOOKING_DETAILS)
+FARE_BY_ID = _select_by_pk(models.Fare, models.Fare.fare_id)
+FARE_DETAILS_BY_ID = _select_by_pk(models.Fare, models.Fare.fare_id, *FARE_DETAILS)
+PASSENGER_DOCUMENT_BY_ID = _select_by_pk(models.Passenger_Document, models.Passenger_Document.document_id)
+TICKET_BY_ID = _select_by_pk(models.Ticket, models.Ticket.ticket_id)
+TICKET_DETAILS_BY_ID = _select_by_pk(models.Ticket, models.Ticket.ticket_id, *TICKET_DETAILS)
+PAYMENT_BY_ID = _select_by_pk(models.Payment, models.Payment.payment_id)
+
 # Passenger CRUD
 def get_passenger(db: Session, passenger_id: UUID) -> Optional[models.Passenger]:
-    logger.info(f"Fetching passenger with ID: {passenger_id}")
-    return db.query(models.Passenger).filter(models.Passenger.passenger_id == passenger_id).first()
+    logger.debug("Fetching passenger with ID: %s", passenger_id)
+    return db.execute(PASSENGER_BY_ID, {"pk": passenger_id}).scalar_one_or_none()
+
+def get_passenger_with_details(db: Session, passenger_id: UUID) -> Optional[models.Passenger]:
+    logger.debug("Fetching passenger with details, ID: %s", passenger_id)
+    return db.execute(PASSENGER_DETAILS_BY_ID, {"pk": passenger_id}).scalar_one_or_none()
+
+def get_passengers(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching passengers with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Passenger, skip, limit)
+
+def get_passengers_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching passengers as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Passenger, skip, limit, after)
 
-def get_passengers(db: Session, skip: int = 0, limit: int = 100) -> List[models.Passenger]:
-    logger.info(f"Fetching passengers with skip: {skip}, limit: {limit}")
-    return db.query(models.Passenger).offset(skip).limit(limit).all()
+def get_passengers_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching passengers page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Passenger, cursor, limit)
+
+def get_passengers_by_ids(db: Session, passenger_ids: Iterable[UUID]) -> Dict[UUID, models.Passenger]:
+    logger.debug("Fetching passengers by IDs")
+    return _get_by_ids(db, models.Passenger, models.Passenger.passenger_id, passenger_ids)
 
 def create_passenger(db: Session, passenger: schemas.PassengerCreate) -> models.Passenger:
-    logger.info(f"Creating passenger: {passenger.first_name} {passenger.last_name}")
-    db_passenger = models.Passenger(**passenger.dict())
+    logger.debug("Creating passenger: %s %s", passenger.first_name, passenger.last_name)
+    db_passenger = models.Passenger(**passenger.model_dump())
     db.add(db_passenger)
     db.commit()
     db.refresh(db_passenger)
-    logger.info(f"Passenger created with ID: {db_passenger.passenger_id}")
+    logger.info("Passenger created with ID: %s", db_passenger.passenger_id)
     return db_passenger
 
+def bulk_create_passengers(db: Session, items: List[schemas.PassengerCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s passengers", len(items))
+    ids = _bulk_create(db, models.Passenger, models.Passenger.passenger_id, items)
+    logger.info("Bulk created %s passengers", len(ids))
+    return ids
+
 def update_passenger(db: Session, passenger_id: UUID, passenger_update: schemas.PassengerUpdate) -> Optional[models.Passenger]:
-    logger.info(f"Updating passenger with ID: {passenger_id}")
+    logger.debug("Updating passenger with ID: %s", passenger_id)
     db_passenger = get_passenger(db, passenger_id)
     if db_passenger:
-        update_data = passenger_update.dict(exclude_unset=True)
+        update_data = passenger_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_passenger, field, value)
         db.commit()
         db.refresh(db_passenger)
-        logger.info(f"Passenger with ID {passenger_id} updated successfully")
+        logger.info("Passenger with ID %s updated successfully", passenger_id)
     else:
-        logger.warning(f"Passenger with ID {passenger_id} not found for update")
+        logger.warning("Passenger with ID %s not found for update", passenger_id)
     return db_passenger
 
 def delete_passenger(db: Session, passenger_id: UUID) -> bool:
-    logger.info(f"Deleting passenger with ID: {passenger_id}")
-    db_passenger = get_passenger(db, passenger_id)
-    if db_passenger:
-        db.delete(db_passenger)
-        db.commit()
-        logger.info(f"Passenger with ID {passenger_id} deleted successfully")
+    logger.debug("Deleting passenger with ID: %s", passenger_id)
+    result = db.execute(delete(models.Passenger).where(models.Passenger.passenger_id == passenger_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Passenger with ID %s deleted successfully", passenger_id)
         return True
-    logger.warning(f"Passenger with ID {passenger_id} not found for deletion")
+    logger.warning("Passenger with ID %s not found for deletion", passenger_id)
     return False
 
 # Flight CRUD
 def get_flight(db: Session, flight_id: UUID) -> Optional[models.Flight]:
-    logger.info(f"Fetching flight with ID: {flight_id}")
-    return db.query(models.Flight).filter(models.Flight.flight_id == flight_id).first()
+    logger.debug("Fetching flight with ID: %s", flight_id)
+    return db.execute(FLIGHT_BY_ID, {"pk": flight_id}).scalar_one_or_none()
+
+def get_flight_with_details(db: Session, flight_id: UUID) -> Optional[models.Flight]:
+    logger.debug("Fetching flight with details, ID: %s", flight_id)
+    return db.execute(FLIGHT_DETAILS_BY_ID, {"pk": flight_id}).scalar_one_or_none()
+
+def get_flights(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching flights with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Flight, skip, limit)
+
+def get_flights_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching flights as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Flight, skip, limit, after)
 
-def get_flights(db: Session, skip: int = 0, limit: int = 100) -> List[models.Flight]:
-    logger.info(f"Fetching flights with skip: {skip}, limit: {limit}")
-    return db.query(models.Flight).offset(skip).limit(limit).all()
+def get_flights_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching flights page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Flight, cursor, limit)
+
+def get_flights_by_ids(db: Session, flight_ids: Iterable[UUID]) -> Dict[UUID, models.Flight]:
+    logger.debug("Fetching flights by IDs")
+    return _get_by_ids(db, models.Flight, models.Flight.flight_id, flight_ids)
+
+def get_flights_by_numbers(db: Session, flight_numbers: Iterable[str]) -> List[models.Flight]:
+    logger.debug("Fetching flights by flight numbers")
+    return _query_in_batches(db, models.Flight, models.Flight.flight_number, flight_numbers)
 
 def create_flight(db: Session, flight: schemas.FlightCreate) -> models.Flight:
-    logger.info(f"Creating flight: {flight.flight_number}")
-    db_flight = models.Flight(**flight.dict())
+    logger.debug("Creating flight: %s", flight.flight_number)
+    db_flight = models.Flight(**flight.model_dump())
     db.add(db_flight)
     db.commit()
     db.refresh(db_flight)
-    logger.info(f"Flight created with ID: {db_flight.flight_id}")
+    logger.info("Flight created with ID: %s", db_flight.flight_id)
     return db_flight
 
+def bulk_create_flights(db: Session, items: List[schemas.FlightCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s flights", len(items))
+    ids = _bulk_create(db, models.Flight, models.Flight.flight_id, items)
+    logger.info("Bulk created %s flights", len(ids))
+    return ids
+
 def update_flight(db: Session, flight_id: UUID, flight_update: schemas.FlightUpdate) -> Optional[models.Flight]:
-    logger.info(f"Updating flight with ID: {flight_id}")
+    logger.debug("Updating flight with ID: %s", flight_id)
     db_flight = get_flight(db, flight_id)
     if db_flight:
-        update_data = flight_update.dict(exclude_unset=True)
+        update_data = flight_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_flight, field, value)
         db.commit()
         db.refresh(db_flight)
-        logger.info(f"Flight with ID {flight_id} updated successfully")
+        logger.info("Flight with ID %s updated successfully", flight_id)
     else:
-        logger.warning(f"Flight with ID {flight_id} not found for update")
+        logger.warning("Flight with ID %s not found for update", flight_id)
     return db_flight
 
 def delete_flight(db: Session, flight_id: UUID) -> bool:
-    logger.info(f"Deleting flight with ID: {flight_id}")
-    db_flight = get_flight(db, flight_id)
-    if db_flight:
-        db.delete(db_flight)
-        db.commit()
-        logger.info(f"Flight with ID {flight_id} deleted successfully")
+    logger.debug("Deleting flight with ID: %s", flight_id)
+    result = db.execute(delete(models.Flight).where(models.Flight.flight_id == flight_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Flight with ID %s deleted successfully", flight_id)
         return True
-    logger.warning(f"Flight with ID {flight_id} not found for deletion")
+    logger.warning("Flight with ID %s not found for deletion", flight_id)
     return False
 
 # Booking CRUD
 def get_booking(db: Session, booking_id: UUID) -> Optional[models.Booking]:
-    logger.info(f"Fetching booking with ID: {booking_id}")
-    return db.query(models.Booking).filter(models.Booking.booking_id == booking_id).first()
+    logger.debug("Fetching booking with ID: %s", booking_id)
+    return db.execute(BOOKING_BY_ID, {"pk": booking_id}).scalar_one_or_none()
+
+def get_booking_with_details(db: Session, booking_id: UUID) -> Optional[models.Booking]:
+    logger.debug("Fetching booking with details, ID: %s", booking_id)
+    return db.execute(BOOKING_DETAILS_BY_ID, {"pk": booking_id}).scalar_one_or_none()
+
+def get_bookings(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching bookings with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Booking, skip, limit)
 
-def get_bookings(db: Session, skip: int = 0, limit: int = 100) -> List[models.Booking]:
-    logger.info(f"Fetching bookings with skip: {skip}, limit: {limit}")
-    return db.query(models.Booking).offset(skip).limit(limit).all()
+def get_bookings_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching bookings as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Booking, skip, limit, after)
+
+def get_bookings_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching bookings page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Booking, cursor, limit)
+
+def get_bookings_by_ids(db: Session, booking_ids: Iterable[UUID]) -> Dict[UUID, models.Booking]:
+    logger.debug("Fetching bookings by IDs")
+    return _get_by_ids(db, models.Booking, models.Booking.booking_id, booking_ids)
 
 def create_booking(db: Session, booking: schemas.BookingCreate) -> models.Booking:
-    logger.info(f"Creating booking for contact: {booking.contact_email}")
-    db_booking = models.Booking(**booking.dict())
+    logger.debug("Creating booking for contact: %s", booking.contact_email)
+    db_booking = models.Booking(**booking.model_dump())
     db.add(db_booking)
     db.commit()
     db.refresh(db_booking)
-    logger.info(f"Booking created with ID: {db_booking.booking_id}")
+    logger.info("Booking created with ID: %s", db_booking.booking_id)
     return db_booking
 
+def bulk_create_bookings(db: Session, items: List[schemas.BookingCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s bookings", len(items))
+    ids = _bulk_create(db, models.Booking, models.Booking.booking_id, items)
+    logger.info("Bulk created %s bookings", len(ids))
+    return ids
+
 def update_booking(db: Session, booking_id: UUID, booking_update: schemas.BookingUpdate) -> Optional[models.Booking]:
-    logger.info(f"Updating booking with ID: {booking_id}")
+    logger.debug("Updating booking with ID: %s", booking_id)
     db_booking = get_booking(db, booking_id)
     if db_booking:
-        update_data = booking_update.dict(exclude_unset=True)
+        update_data = booking_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_booking, field, value)
         db.commit()
         db.refresh(db_booking)
-        logger.info(f"Booking with ID {booking_id} updated successfully")
+        logger.info("Booking with ID %s updated successfully", booking_id)
     else:
-        logger.warning(f"Booking with ID {booking_id} not found for update")
+        logger.warning("Booking with ID %s not found for update", booking_id)
     return db_booking
 
 def delete_booking(db: Session, booking_id: UUID) -> bool:
-    logger.info(f"Deleting booking with ID: {booking_id}")
-    db_booking = get_booking(db, booking_id)
-    if db_booking:
-        db.delete(db_booking)
-        db.commit()
-        logger.info(f"Booking with ID {booking_id} deleted successfully")
+    logger.debug("Deleting booking with ID: %s", booking_id)
+    result = db.execute(delete(models.Booking).where(models.Booking.booking_id == booking_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Booking with ID %s deleted successfully", booking_id)
         return True
-    logger.warning(f"Booking with ID {booking_id} not found for deletion")
+    logger.warning("Booking with ID %s not found for deletion", booking_id)
     return False
 
 # Fare CRUD
 def get_fare(db: Session, fare_id: UUID) -> Optional[models.Fare]:
-    logger.info(f"Fetching fare with ID: {fare_id}")
-    return db.query(models.Fare).filter(models.Fare.fare_id == fare_id).first()
+    logger.debug("Fetching fare with ID: %s", fare_id)
+    return db.execute(FARE_BY_ID, {"pk": fare_id}).scalar_one_or_none()
+
+def get_fare_with_details(db: Session, fare_id: UUID) -> Optional[models.Fare]:
+    logger.debug("Fetching fare with details, ID: %s", fare_id)
+    return db.execute(FARE_DETAILS_BY_ID, {"pk": fare_id}).scalar_one_or_none()
+
+def get_fares(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching fares with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Fare, skip, limit)
 
-def get_fares(db: Session, skip: int = 0, limit: int = 100) -> List[models.Fare]:
-    logger.info(f"Fetching fares with skip: {skip}, limit: {limit}")
-    return db.query(models.Fare).offset(skip).limit(limit).all()
+def get_fares_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching fares as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Fare, skip, limit, after)
+
+def get_fares_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching fares page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Fare, cursor, limit)
+
+def get_fares_by_ids(db: Session, fare_ids: Iterable[UUID]) -> Dict[UUID, models.Fare]:
+    logger.debug("Fetching fares by IDs")
+    return _get_by_ids(db, models.Fare, models.Fare.fare_id, fare_ids)
+
+def get_fares_by_flight_ids(db: Session, flight_ids: Iterable[UUID]) -> List[models.Fare]:
+    logger.debug("Fetching fares by flight IDs")
+    return _query_in_batches(db, models.Fare, models.Fare.flight_id, flight_ids)
 
 def create_fare(db: Session, fare: schemas.FareCreate) -> models.Fare:
-    logger.info(f"Creating fare for flight: {fare.flight_id}")
-    db_fare = models.Fare(**fare.dict())
+    logger.debug("Creating fare for flight: %s", fare.flight_id)
+    db_fare = models.Fare(**fare.model_dump())
     db.add(db_fare)
     db.commit()
     db.refresh(db_fare)
-    logger.info(f"Fare created with ID: {db_fare.fare_id}")
+    logger.info("Fare created with ID: %s", db_fare.fare_id)
     return db_fare
 
+def bulk_create_fares(db: Session, items: List[schemas.FareCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s fares", len(items))
+    ids = _bulk_create(db, models.Fare, models.Fare.fare_id, items)
+    logger.info("Bulk created %s fares", len(ids))
+    return ids
+
 def update_fare(db: Session, fare_id: UUID, fare_update: schemas.FareUpdate) -> Optional[models.Fare]:
-    logger.info(f"Updating fare with ID: {fare_id}")
+    logger.debug("Updating fare with ID: %s", fare_id)
     db_fare = get_fare(db, fare_id)
     if db_fare:
-        update_data = fare_update.dict(exclude_unset=True)
+        update_data = fare_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_fare, field, value)
         db.commit()
         db.refresh(db_fare)
-        logger.info(f"Fare with ID {fare_id} updated successfully")
+        logger.info("Fare with ID %s updated successfully", fare_id)
     else:
-        logger.warning(f"Fare with ID {fare_id} not found for update")
+        logger.warning("Fare with ID %s not found for update", fare_id)
     return db_fare
 
 def delete_fare(db: Session, fare_id: UUID) -> bool:
-    logger.info(f"Deleting fare with ID: {fare_id}")
-    db_fare = get_fare(db, fare_id)
-    if db_fare:
-        db.delete(db_fare)
-        db.commit()
-        logger.info(f"Fare with ID {fare_id} deleted successfully")
+    logger.debug("Deleting fare with ID: %s", fare_id)
+    result = db.execute(delete(models.Fare).where(models.Fare.fare_id == fare_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Fare with ID %s deleted successfully", fare_id)
         return True
-    logger.warning(f"Fare with ID {fare_id} not found for deletion")
+    logger.warning("Fare with ID %s not found for deletion", fare_id)
     return False
 
 # Passenger Document CRUD
 def get_passenger_document(db: Session, document_id: UUID) -> Optional[models.Passenger_Document]:
-    logger.info(f"Fetching passenger document with ID: {document_id}")
-    return db.query(models.Passenger_Document).filter(models.Passenger_Document.document_id == document_id).first()
+    logger.debug("Fetching passenger document with ID: %s", document_id)
+    return db.execute(PASSENGER_DOCUMENT_BY_ID, {"pk": document_id}).scalar_one_or_none()
+
+def get_passenger_documents(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching passenger documents with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Passenger_Document, skip, limit)
 
-def get_passenger_documents(db: Session, skip: int = 0, limit: int = 100) -> List[models.Passenger_Document]:
-    logger.info(f"Fetching passenger documents with skip: {skip}, limit: {limit}")
-    return db.query(models.Passenger_Document).offset(skip).limit(limit).all()
+def get_passenger_documents_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching passenger documents as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Passenger_Document, skip, limit, after)
+
+def get_passenger_documents_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching passenger documents page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Passenger_Document, cursor, limit)
+
+def get_passenger_documents_by_ids(db: Session, document_ids: Iterable[UUID]) -> Dict[UUID, models.Passenger_Document]:
+    logger.debug("Fetching passenger documents by IDs")
+    return _get_by_ids(db, models.Passenger_Document, models.Passenger_Document.document_id, document_ids)
 
 def create_passenger_document(db: Session, document: schemas.PassengerDocumentCreate) -> models.Passenger_Document:
-    logger.info(f"Creating passenger document for passenger: {document.passenger_id}")
-    db_document = models.Passenger_Document(**document.dict())
+    logger.debug("Creating passenger document for passenger: %s", document.passenger_id)
+    db_document = models.Passenger_Document(**document.model_dump())
     db.add(db_document)
     db.commit()
     db.refresh(db_document)
-    logger.info(f"Passenger document created with ID: {db_document.document_id}")
+    logger.info("Passenger document created with ID: %s", db_document.document_id)
     return db_document
 
+def bulk_create_passenger_documents(db: Session, items: List[schemas.PassengerDocumentCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s passenger documents", len(items))
+    ids = _bulk_create(db, models.Passenger_Document, models.Passenger_Document.document_id, items)
+    logger.info("Bulk created %s passenger documents", len(ids))
+    return ids
+
 def update_passenger_document(db: Session, document_id: UUID, document_update: schemas.PassengerDocumentUpdate) -> Optional[models.Passenger_Document]:
-    logger.info(f"Updating passenger document with ID: {document_id}")
+    logger.debug("Updating passenger document with ID: %s", document_id)
     db_document = get_passenger_document(db, document_id)
     if db_document:
-        update_data = document_update.dict(exclude_unset=True)
+        update_data = document_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_document, field, value)
         db.commit()
         db.refresh(db_document)
-        logger.info(f"Passenger document with ID {document_id} updated successfully")
+        logger.info("Passenger document with ID %s updated successfully", document_id)
     else:
-        logger.warning(f"Passenger document with ID {document_id} not found for update")
+        logger.warning("Passenger document with ID %s not found for update", document_id)
     return db_document
 
 def delete_passenger_document(db: Session, document_id: UUID) -> bool:
-    logger.info(f"Deleting passenger document with ID: {document_id}")
-    db_document = get_passenger_document(db, document_id)
-    if db_document:
-        db.delete(db_document)
-        db.commit()
-        logger.info(f"Passenger document with ID {document_id} deleted successfully")
+    logger.debug("Deleting passenger document with ID: %s", document_id)
+    result = db.execute(delete(models.Passenger_Document).where(models.Passenger_Document.document_id == document_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Passenger document with ID %s deleted successfully", document_id)
         return True
-    logger.warning(f"Passenger document with ID {document_id} not found for deletion")
+    logger.warning("Passenger document with ID %s not found for deletion", document_id)
     return False
 
 # Ticket CRUD
 def get_ticket(db: Session, ticket_id: UUID) -> Optional[models.Ticket]:
-    logger.info(f"Fetching ticket with ID: {ticket_id}")
-    return db.query(models.Ticket).filter(models.Ticket.ticket_id == ticket_id).first()
+    logger.debug("Fetching ticket with ID: %s", ticket_id)
+    return db.execute(TICKET_BY_ID, {"pk": ticket_id}).scalar_one_or_none()
+
+def get_ticket_with_details(db: Session, ticket_id: UUID) -> Optional[models.Ticket]:
+    logger.debug("Fetching ticket with details, ID: %s", ticket_id)
+    return db.execute(TICKET_DETAILS_BY_ID, {"pk": ticket_id}).scalar_one_or_none()
+
+def get_tickets(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching tickets with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Ticket, skip, limit)
 
-def get_tickets(db: Session, skip: int = 0, limit: int = 100) -> List[models.Ticket]:
-    logger.info(f"Fetching tickets with skip: {skip}, limit: {limit}")
-    return db.query(models.Ticket).offset(skip).limit(limit).all()
+def get_tickets_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching tickets as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Ticket, skip, limit, after)
+
+def get_tickets_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching tickets page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Ticket, cursor, limit)
+
+def get_tickets_by_ids(db: Session, ticket_ids: Iterable[UUID]) -> Dict[UUID, models.Ticket]:
+    logger.debug("Fetching tickets by IDs")
+    return _get_by_ids(db, models.Ticket, models.Ticket.ticket_id, ticket_ids)
 
 def create_ticket(db: Session, ticket: schemas.TicketCreate) -> models.Ticket:
-    logger.info(f"Creating ticket with number: {ticket.ticket_number}")
-    db_ticket = models.Ticket(**ticket.dict())
+    logger.debug("Creating ticket with number: %s", ticket.ticket_number)
+    db_ticket = models.Ticket(**ticket.model_dump())
     db.add(db_ticket)
     db.commit()
     db.refresh(db_ticket)
-    logger.info(f"Ticket created with ID: {db_ticket.ticket_id}")
+    logger.info("Ticket created with ID: %s", db_ticket.ticket_id)
     return db_ticket
 
+def bulk_create_tickets(db: Session, items: List[schemas.TicketCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s tickets", len(items))
+    ids = _bulk_create(db, models.Ticket, models.Ticket.ticket_id, items)
+    logger.info("Bulk created %s tickets", len(ids))
+    return ids
+
 def update_ticket(db: Session, ticket_id: UUID, ticket_update: schemas.TicketUpdate) -> Optional[models.Ticket]:
-    logger.info(f"Updating ticket with ID: {ticket_id}")
+    logger.debug("Updating ticket with ID: %s", ticket_id)
     db_ticket = get_ticket(db, ticket_id)
     if db_ticket:
-        update_data = ticket_update.dict(exclude_unset=True)
+        update_data = ticket_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_ticket, field, value)
         db.commit()
         db.refresh(db_ticket)
-        logger.info(f"Ticket with ID {ticket_id} updated successfully")
+        logger.info("Ticket with ID %s updated successfully", ticket_id)
     else:
-        logger.warning(f"Ticket with ID {ticket_id} not found for update")
+        logger.warning("Ticket with ID %s not found for update", ticket_id)
     return db_ticket
 
 def delete_ticket(db: Session, ticket_id: UUID) -> bool:
-    logger.info(f"Deleting ticket with ID: {ticket_id}")
-    db_ticket = get_ticket(db, ticket_id)
-    if db_ticket:
-        db.delete(db_ticket)
-        db.commit()
-        logger.info(f"Ticket with ID {ticket_id} deleted successfully")
+    logger.debug("Deleting ticket with ID: %s", ticket_id)
+    result = db.execute(delete(models.Ticket).where(models.Ticket.ticket_id == ticket_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Ticket with ID %s deleted successfully", ticket_id)
         return True
-    logger.warning(f"Ticket with ID {ticket_id} not found for deletion")
+    logger.warning("Ticket with ID %s not found for deletion", ticket_id)
     return False
 
 # Payment CRUD
 def get_payment(db: Session, payment_id: UUID) -> Optional[models.Payment]:
-    logger.info(f"Fetching payment with ID: {payment_id}")
-    return db.query(models.Payment).filter(models.Payment.payment_id == payment_id).first()
+    logger.debug("Fetching payment with ID: %s", payment_id)
+    return db.execute(PAYMENT_BY_ID, {"pk": payment_id}).scalar_one_or_none()
+
+def get_payments(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    logger.debug("Fetching payments with skip: %s, limit: %s", skip, limit)
+    return _get_list_rows(db, models.Payment, skip, limit)
+
+def get_payments_json(db: Session, skip: int = 0, limit: int = 100, after: Optional[UUID] = None) -> str:
+    logger.debug("Fetching payments as JSON with skip: %s, limit: %s, after: %s", skip, limit, after)
+    return _get_list_json(db, models.Payment, skip, limit, after)
 
-def get_payments(db: Session, skip: int = 0, limit: int = 100) -> List[models.Payment]:
-    logger.info(f"Fetching payments with skip: {skip}, limit: {limit}")
-    return db.query(models.Payment).offset(skip).limit(limit).all()
+def get_payments_page_json(db: Session, cursor: Optional[UUID] = None, limit: int = 100) -> str:
+    logger.debug("Fetching payments page with cursor: %s, limit: %s", cursor, limit)
+    return _get_page_json(db, models.Payment, cursor, limit)
+
+def get_payments_by_ids(db: Session, payment_ids: Iterable[UUID]) -> Dict[UUID, models.Payment]:
+    logger.debug("Fetching payments by IDs")
+    return _get_by_ids(db, models.Payment, models.Payment.payment_id, payment_ids)
 
 def create_payment(db: Session, payment: schemas.PaymentCreate) -> models.Payment:
-    logger.info(f"Creating payment for booking: {payment.booking_id}")
-    db_payment = models.Payment(**payment.dict())
+    logger.debug("Creating payment for booking: %s", payment.booking_id)
+    db_payment = models.Payment(**payment.model_dump())
     db.add(db_payment)
     db.commit()
     db.refresh(db_payment)
-    logger.info(f"Payment created with ID: {db_payment.payment_id}")
+    logger.info("Payment created with ID: %s", db_payment.payment_id)
     return db_payment
 
+def bulk_create_payments(db: Session, items: List[schemas.PaymentCreate]) -> List[UUID]:
+    logger.debug("Bulk creating %s payments", len(items))
+    ids = _bulk_create(db, models.Payment, models.Payment.payment_id, items)
+    logger.info("Bulk created %s payments", len(ids))
+    return ids
+
 def update_payment(db: Session, payment_id: UUID, payment_update: schemas.PaymentUpdate) -> Optional[models.Payment]:
-    logger.info(f"Updating payment with ID: {payment_id}")
+    logger.debug("Updating payment with ID: %s", payment_id)
     db_payment = get_payment(db, payment_id)
     if db_payment:
-        update_data = payment_update.dict(exclude_unset=True)
+        update_data = payment_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_payment, field, value)
         db.commit()
         db.refresh(db_payment)
-        logger.info(f"Payment with ID {payment_id} updated successfully")
+        logger.info("Payment with ID %s updated successfully", payment_id)
     else:
-        logger.warning(f"Payment with ID {payment_id} not found for update")
+        logger.warning("Payment with ID %s not found for update", payment_id)
     return db_payment
 
 def delete_payment(db: Session, payment_id: UUID) -> bool:
-    logger.info(f"Deleting payment with ID: {payment_id}")
-    db_payment = get_payment(db, payment_id)
-    if db_payment:
-        db.delete(db_payment)
-        db.commit()
-        logger.info(f"Payment with ID {payment_id} deleted successfully")
+    logger.debug("Deleting payment with ID: %s", payment_id)
+    result = db.execute(delete(models.Payment).where(models.Payment.payment_id == payment_id))
+    db.commit()
+    if result.rowcount:
+        logger.info("Payment with ID %s deleted successfully", payment_id)
         return True
-    logger.warning(f"Payment with ID {payment_id} not found for deletion")
+    logger.warning("Payment with ID %s not found for deletion", payment_id)
     return False
 
 # Dictionary CRUD operations
-def get_booking_statuses(db: Session, skip: int = 0, limit: int = 100) -> List[models.Dictionary_BookingStatus]:
-    return db.query(models.Dictionary_BookingStatus).offset(skip).limit(limit).all()
+# Dictionary tables change rarely, so results are cached per (skip, limit) for DICTIONARY_CACHE_TTL seconds
+DICTIONARY_CACHE_TTL = 300
+
+def _dictionary_cache_key(db: Session, skip: int = 0, limit: int = 100):
+    return hashkey(skip, limit)
+
+@cached(TTLCache(maxsize=32, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_cache_key, lock=threading.Lock())
+def get_booking_statuses(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    return _get_list_rows(db, models.Dictionary_BookingStatus, skip, limit)
+
+@cached(TTLCache(maxsize=32, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_cache_key, lock=threading.Lock())
+def get_document_types(db: Session, skip: int = 0, limit: int = 100) -> List[Row]:
+    return _get_list_rows(db, models.Dictionary_DocumentType, skip, limit)
+
+def _dictionary_ids_key(db: Session):
+    return hashkey()
+
+# Known dictionary keys, used by the routers to reject unknown FK values before any INSERT/UPDATE
+@cached(TTLCache(maxsize=1, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_ids_key, lock=threading.Lock())
+def get_booking_status_ids(db: Session) -> frozenset:
+    return frozenset(db.execute(select(models.Dictionary_BookingStatus.status_id)).scalars())
+
+@cached(TTLCache(maxsize=1, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_ids_key, lock=threading.Lock())
+def get_document_type_ids(db: Session) -> frozenset:
+    return frozenset(db.execute(select(models.Dictionary_DocumentType.document_type_id)).scalars())
+
+# The JSON variants cache the encoded body, so a hit is handed to the Response without re-encoding
+@cached(TTLCache(maxsize=32, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_cache_key, lock=threading.Lock())
+def get_booking_statuses_json(db: Session, skip: int = 0, limit: int = 100) -> bytes:
+    return _get_list_json(db, models.Dictionary_BookingStatus, skip, limit).encode("utf-8")
 
-def get_document_types(db: Session, skip: int = 0, limit: int = 100) -> List[models.Dictionary_DocumentType]:
-    return db.query(models.Dictionary_DocumentType).offset(skip).limit(limit).all()
\ No newline at end of file
+@cached(TTLCache(maxsize=32, ttl=DICTIONARY_CACHE_TTL), key=_dictionary_cache_key, lock=threading.Lock())
+def get_document_types_json(db: Session, skip: int = 0, limit: int = 100) -> bytes:
+    return _get_list_json(db, models.Dictionary_DocumentType, skip, limit).encode("utf-8")
\ No newline at end of file
@@ -1,25 +1,66 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import logging
+import queue
+import atexit
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 # Load environment variables
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    # pyodbc: send executemany batches as a single parameter array instead of one round trip per row
+    fast_executemany=True,
+    insertmanyvalues_page_size=1000,
+    # compiled SQL cache; sized for the per-id getters and their eager-loading variants
+    query_cache_size=int(os.getenv("DB_QUERY_CACHE_SIZE", "1200")),
     echo=False  # Set to True for SQL query logging
 )
 
+# Slow query logging: statements slower than DB_SLOW_QUERY_MS are logged with a warning (0 disables it)
+DB_SLOW_QUERY_MS = int(os.getenv("DB_SLOW_QUERY_MS", "100"))
+slow_query_logger = logging.getLogger("app.database.slow_query")
+
+if DB_SLOW_QUERY_MS > 0:
+    # The start time lives on the per-statement execution context, so a statement that raises leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._query_start_time) * 1000
+        if elapsed_ms > DB_SLOW_QUERY_MS:
+            slow_query_logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions for GET endpoints: AUTOCOMMIT connections run each SELECT outside an explicit transaction,
+# so there is no ROLLBACK round trip when the connection goes back to the pool; nothing is flushed or
+# expired since these sessions never write
+ReadOnlySessionLocal = sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class
 Base = declarative_base()
 
@@ -31,12 +72,27 @@ def get_db():
     finally:
         db.close()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/api.log'),
-        logging.StreamHandler()
-    ]
-)
\ No newline at end of file
+def get_readonly_db():
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Configure logging: handlers write to file/console from a background thread,
+# the caller only puts the record on a queue
+log_queue = queue.Queue(-1)
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+file_handler = logging.FileHandler('logs/api.log')
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(QueueHandler(log_queue))
@@ -1,22 +1,40 @@
-from .extractors import DataExtractor, PassengerDataExtractor, FlightDataExtractor
-from .transformers import PassengerDataTransformer, FlightDataTransformer, FareDataTransformer
-from .loaders import PassengerDataLoader, FlightDataLoader, FareDataLoader, VisualizationEngine
-from .validators import DataValidator, PassengerValidator, FlightValidator
-from .orchestrator import ETLOrchestrator
-
-__all__ = [
-    'DataExtractor',
-    'PassengerDataExtractor',
-    'FlightDataExtractor',
-    'PassengerDataTransformer',
-    'FlightDataTransformer',
-    'FareDataTransformer',
-    'PassengerDataLoader',
-    'FlightDataLoader',
-    'FareDataLoader',
-    'VisualizationEngine',
-    'DataValidator',
-    'PassengerValidator',
-    'FlightValidator',
-    'ETLOrchestrator'
-]
\ No newline at end of file
+import importlib
+
+# Подмодули ETL тянут pandas/numpy, поэтому загружаются при первом обращении к имени (PEP 562)
+_LAZY_IMPORTS = {
+    'DataExtractor': 'extractors',
+    'PassengerDataExtractor': 'extractors',
+    'FlightDataExtractor': 'extractors',
+    'PassengerDataTransformer': 'transformers',
+    'FlightDataTransformer': 'transformers',
+    'FareDataTransformer': 'transformers',
+    'PassengerDataLoader': 'loaders',
+    'FlightDataLoader': 'loaders',
+    'FareDataLoader': 'loaders',
+    'VisualizationEngine': 'loaders',
+    'DataValidator': 'validators',
+    'PassengerValidator': 'validators',
+    'FlightValidator': 'validators',
+    'ETLOrchestrator': 'orchestrator'
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def run_file_task(kind: str, file_path: str):
+    """Обработка файла в процессе ETL-пула; pandas и оркестратор импортируются только в этом процессе"""
+    from app.etl.orchestrator import process_file_task
+    return process_file_task(kind, file_path)
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -1,31 +1,150 @@
 import pandas as pd
+import csv
 import os
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import logging
 from config.etl_config import etl_config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow входит в requirements, но без него работает C-парсер pandas
+    pa = pa_csv = None
+
+# Размер блока потокового CSV-ридера pyarrow (байт файла на одну пачку записей)
+CSV_BLOCK_SIZE = 8 << 20
+# Те же значения-пропуски, что у pandas.read_csv по умолчанию
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+
+def _iter_arrow_csv(full_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Потоковое чтение CSV ридером pyarrow: пачки записей собираются в порции по chunk_size строк.
+    Все столбцы читаются строками, индекс строк сквозной по всему файлу (как у pandas с chunksize)"""
+    with open(full_path, encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f), [])
+
+    reader = pa_csv.open_csv(
+        full_path,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=dict.fromkeys(header, pa.string()),
+            null_values=CSV_NULL_VALUES,
+            strings_can_be_null=True
+        )
+    )
+
+    start = 0
+
+    def to_frame(table) -> pd.DataFrame:
+        nonlocal start
+        df = table.to_pandas()
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        return df
+
+    batches, rows = [], 0
+    for batch in reader:
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows < chunk_size:
+            continue
+        table = pa.Table.from_batches(batches)
+        offset = 0
+        while rows - offset >= chunk_size:
+            yield to_frame(table.slice(offset, chunk_size))
+            offset += chunk_size
+        rest = table.slice(offset)
+        batches, rows = rest.to_batches(), rest.num_rows
+
+    if rows or start == 0:
+        yield to_frame(pa.Table.from_batches(batches, schema=reader.schema))
+
+
+@lru_cache(maxsize=1)
+def _read_workbook(full_path: str, mtime: float) -> Dict[str, pd.DataFrame]:
+    """Чтение всех листов книги за один разбор файла (mtime входит в ключ кэша)"""
+    sheets = pd.read_excel(full_path, sheet_name=None)
+    logger.info(f"Успешно извлечены листы {list(sheets)} из Excel: {full_path}")
+    return sheets
+
+
+def prefetch_chunks(chunks: Iterable[pd.DataFrame], depth: int = 2) -> Iterator[pd.DataFrame]:
+    """
+    Чтение порций в фоновом потоке: следующая порция читается с диска, пока текущая обрабатывается.
+    Очередь ограничена depth порциями, поэтому чтение не убегает вперед обработки
+    """
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Ожидание места в очереди с проверкой, не прекратил ли потребитель чтение
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(done)
+
+    threading.Thread(target=produce, name='etl-prefetch', daemon=True).start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
 
 class DataExtractor:
     """Базовый класс для извлечения данных из файлов"""
 
     def __init__(self):
         self.supported_formats = ['.csv', '.xlsx', '.xls']
+        self._suffix_set = frozenset(self.supported_formats)
 
     def list_available_files(self) -> List[str]:
         """Получить список доступных файлов для обработки"""
-        files = []
-        for file in os.listdir(etl_config.INPUT_DIR):
-            if any(file.lower().endswith(fmt) for fmt in self.supported_formats):
-                files.append(file)
+        with os.scandir(etl_config.INPUT_DIR) as entries:
+            files = [
+                entry.name for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in self._suffix_set
+            ]
         logger.info(f"Найдено файлов для обработки: {files}")
         return files
 
     def extract_from_csv(self, file_path: str, **kwargs) -> pd.DataFrame:
         """Извлечение данных из CSV файла"""
         try:
-            df = pd.read_csv(file_path, **kwargs)
+            try:
+                # Многопоточный парсер pyarrow
+                df = pd.read_csv(file_path, **{'engine': 'pyarrow', **kwargs})
+            except (ImportError, ValueError):
+                # pyarrow не установлен или не поддерживает переданные опции (например, nrows)
+                df = pd.read_csv(file_path, **kwargs)
             logger.info(f"Успешно извлечено {len(df)} записей из CSV: {file_path}")
             return df
         except Exception as e:
@@ -56,6 +175,45 @@ class DataExtractor:
         else:
             raise ValueError(f"Неподдерживаемый формат файла: {file_path}")
 
+    def iter_chunks(self, file_path: str, chunk_size: int = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """Чтение файла порциями по chunk_size строк (индекс строк сквозной по всему файлу)"""
+        chunk_size = chunk_size or etl_config.CHUNK_SIZE
+        full_path = os.path.join(etl_config.INPUT_DIR, file_path)
+
+        if not os.path.exists(full_path):
+            raise FileNotFoundError(f"Файл не найден: {full_path}")
+
+        if full_path.lower().endswith('.csv'):
+            # Типы выводятся по каждой порции отдельно, поэтому все читается строками,
+            # иначе один и тот же столбец (например, телефон) в разных порциях получит разный тип
+            if pa_csv is not None and not kwargs:
+                yield from _iter_arrow_csv(full_path, chunk_size)
+                return
+            # Дополнительные опции read_csv понимает только C-парсер pandas
+            kwargs.setdefault('dtype', str)
+            with pd.read_csv(full_path, chunksize=chunk_size, **kwargs) as reader:
+                yield from reader
+        elif full_path.lower().endswith(('.xlsx', '.xls')):
+            # Excel не читается потоково, поэтому книга разбирается целиком и отдается порциями
+            df = self.extract_from_excel(full_path, **kwargs)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {full_path}")
+
+    @staticmethod
+    def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Приведение названий колонок к виду snake_case"""
+        df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_', regex=False)
+        return df
+
+    @staticmethod
+    def _drop_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
+        """Удаление полностью пустых строк (без копирования, если пропусков нет вовсе)"""
+        if df.isnull().values.any():
+            df = df.dropna(how='all')
+        return df
+
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Получить информацию о файле"""
         full_path = os.path.join(etl_config.INPUT_DIR, file_path)
@@ -77,36 +235,64 @@ class PassengerDataExtractor(DataExtractor):
         df = self.extract_data(file_path)
 
         # Базовая очистка названий колонок
-        df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
+        self._normalize_columns(df)
 
         # Удаление полностью пустых строк
-        df = df.dropna(how='all')
+        df = self._drop_empty_rows(df)
 
         logger.info(f"Извлечены данные пассажиров: {len(df)} записей, колонки: {list(df.columns)}")
         return df
 
+    def stream_passengers_data(self, file_path: str, chunk_size: int = None) -> Iterator[pd.DataFrame]:
+        """Потоковое извлечение данных пассажиров порциями с той же базовой очисткой"""
+        for chunk in self.iter_chunks(file_path, chunk_size):
+            self._normalize_columns(chunk)
+            chunk = self._drop_empty_rows(chunk)
+            logger.info(f"Извлечена порция пассажиров: {len(chunk)} записей")
+            yield chunk
+
 
 class FlightDataExtractor(DataExtractor):
     """Специализированный экстрактор для данных рейсов"""
 
+    def extract_all_sheets(self, file_path: str) -> Dict[str, pd.DataFrame]:
+        """Извлечение всех листов Excel файла; повторный вызов для того же файла не перечитывает его"""
+        full_path = os.path.join(etl_config.INPUT_DIR, file_path)
+
+        if not os.path.exists(full_path):
+            raise FileNotFoundError(f"Файл не найден: {full_path}")
+
+        return _read_workbook(full_path, os.path.getmtime(full_path))
+
+    def _extract_sheet(self, file_path: str, sheet_name: str) -> pd.DataFrame:
+        """Извлечение листа; рейсы и тарифы берутся из одного разбора книги"""
+        if not file_path.lower().endswith(('.xlsx', '.xls')):
+            return self.extract_data(file_path, sheet_name=sheet_name)
+
+        sheets = self.extract_all_sheets(file_path)
+        if sheet_name not in sheets:
+            raise ValueError(f"Лист {sheet_name} не найден в файле {file_path}")
+        # Копия, чтобы очистка не портила закэшированный лист
+        return sheets[sheet_name].copy()
+
     def extract_flights_data(self, file_path: str, sheet_name: str = 'Flights') -> pd.DataFrame:
         """Извлечение данных рейсов"""
-        df = self.extract_data(file_path, sheet_name=sheet_name)
+        df = self._extract_sheet(file_path, sheet_name)
 
         # Базовая очистка
-        df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
-        df = df.dropna(how='all')
+        self._normalize_columns(df)
+        df = self._drop_empty_rows(df)
 
         logger.info(f"Извлечены данные рейсов: {len(df)} записей")
         return df
 
     def extract_fares_data(self, file_path: str, sheet_name: str = 'Fares') -> pd.DataFrame:
         """Извлечение данных тарифов"""
-        df = self.extract_data(file_path, sheet_name=sheet_name)
+        df = self._extract_sheet(file_path, sheet_name)
 
         # Базовая очистка
-        df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
-        df = df.dropna(how='all')
+        self._normalize_columns(df)
+        df = self._drop_empty_rows(df)
 
         logger.info(f"Извлечены данные тарифов: {len(df)} записей")
         return df
\ No newline at end of file
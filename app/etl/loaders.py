@@ -1,15 +1,15 @@
 import pandas as pd
 import os
 import json
+from collections import Counter
 from typing import Dict, List, Any, Tuple
 import logging
 from datetime import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import crud, schemas, models
+from app.ids import sequential_uuid
 from config.etl_config import etl_config
 
 logger = logging.getLogger(__name__)
@@ -20,50 +20,90 @@ class DataLoader:
 
     def __init__(self, db: Session):
         self.db = db
+        self._error_reports = {}  # process_type -> открытый (дописываемый) отчет об ошибках
 
     def save_errors_report(self, errors_df: pd.DataFrame, source_file: str, process_type: str):
         """Сохранение отчета об ошибках"""
-        if errors_df.empty:
-            return
+        self.append_errors(errors_df, source_file, process_type)
+        self.finalize_errors_report(process_type)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        error_file = f"{process_type}_errors_{timestamp}.csv"
-        error_path = os.path.join(etl_config.ERRORS_DIR, error_file)
+    def append_errors(self, errors_df: pd.DataFrame, source_file: str, process_type: str):
+        """Дозапись порции ошибок в CSV-отчет, чтобы не накапливать ошибки всего файла в памяти"""
+        if len(errors_df) == 0:
+            return
 
-        # Сохраняем ошибки в CSV
-        errors_df.to_csv(error_path, index=False, encoding='utf-8')
+        report = self._error_reports.get(process_type)
+        if report is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Имя исходного файла в имени отчета: файлы одного типа, обработанные в одну секунду, не пишут в общий CSV
+            report_name = f"{os.path.splitext(os.path.basename(source_file))[0]}_{timestamp}"
+            report = {
+                'source_file': source_file,
+                'timestamp': timestamp,
+                'report_name': report_name,
+                'error_path': os.path.join(etl_config.ERRORS_DIR, f"{process_type}_errors_{report_name}.csv"),
+                'total_errors': 0,
+                'error_categories': Counter()
+            }
+            self._error_reports[process_type] = report
+
+        # Заголовок пишется только с первой порцией
+        errors_df.to_csv(report['error_path'], mode='a', header=report['total_errors'] == 0,
+                         index=False, encoding='utf-8')
+
+        report['total_errors'] += len(errors_df)
+        report['error_categories'].update(self._categorize_errors(errors_df))
+
+    def finalize_errors_report(self, process_type: str):
+        """Завершение отчета об ошибках: сохранение сводки в JSON"""
+        report = self._error_reports.pop(process_type, None)
+        if report is None:
+            return
 
-        # Сохраняем сводку в JSON
         summary = {
-            'source_file': source_file,
+            'source_file': report['source_file'],
             'process_type': process_type,
-            'timestamp': timestamp,
-            'total_errors': len(errors_df),
-            'error_categories': self._categorize_errors(errors_df)
+            'timestamp': report['timestamp'],
+            'total_errors': report['total_errors'],
+            'error_categories': dict(report['error_categories'])
         }
 
-        summary_file = f"{process_type}_summary_{timestamp}.json"
+        summary_file = f"{process_type}_summary_{report['report_name']}.json"
         summary_path = os.path.join(etl_config.ERRORS_DIR, summary_file)
 
         with open(summary_path, 'w', encoding='utf-8') as f:
             json.dump(summary, f, ensure_ascii=False, indent=2)
 
-        logger.info(f"Отчет об ошибках сохранен: {error_path}")
+        logger.info(f"Отчет об ошибках сохранен: {report['error_path']}")
 
     def _categorize_errors(self, errors_df: pd.DataFrame) -> Dict[str, int]:
         """Категоризация ошибок"""
-        categories = {}
-        for errors in errors_df['_errors']:
-            for error in errors:
-                category = error.split(':')[0] if ':' in error else 'Общие ошибки'
-                categories[category] = categories.get(category, 0) + 1
-        return categories
+        errors = errors_df['_errors'].explode().dropna().astype(str)
+        categories = errors.str.split(':', n=1).str[0].where(errors.str.contains(':', regex=False), 'Общие ошибки')
+        return categories.value_counts(sort=False).to_dict()
 
 
 class PassengerDataLoader(DataLoader):
     """Загрузчик данных пассажиров"""
 
-    def load_passenger_data(self, valid_df: pd.DataFrame, source_file: str) -> Dict[str, Any]:
+    PASSENGER_COLUMNS = ['first_name', 'last_name', 'date_of_birth', 'email', 'phone_number']
+    DOCUMENT_COLUMNS = ['document_type', 'document_number', 'expiry_date', 'country_of_issue']
+    REQUIRED_FIELDS = ['first_name', 'last_name', 'date_of_birth', 'document_type', 'document_number',
+                       'country_of_issue']
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self._doc_type_mapping = None
+
+    @property
+    def doc_type_mapping(self) -> Dict[str, int]:
+        """Маппинг кодов типов документов на их ID (запрашивается из БД один раз)"""
+        if self._doc_type_mapping is None:
+            doc_types = self.db.query(models.Dictionary_DocumentType).all()
+            self._doc_type_mapping = {dt.type_code: dt.document_type_id for dt in doc_types}
+        return self._doc_type_mapping
+
+    def load_passenger_data(self, valid_df: pd.DataFrame, source_file: str, commit: bool = True) -> Dict[str, Any]:
         """Загрузка данных пассажиров в БД"""
         stats = {
             'total_processed': len(valid_df),
@@ -72,45 +112,69 @@ class PassengerDataLoader(DataLoader):
             'errors': []
         }
 
-        # Получаем маппинг типов документов из БД
-        doc_types = self.db.query(models.Dictionary_DocumentType).all()
-        doc_type_mapping = {dt.type_code: dt.document_type_id for dt in doc_types}
+        # Проверка всего набора разом: обязательные поля, тип документа и даты
+        df = valid_df.reindex(columns=self.PASSENGER_COLUMNS + self.DOCUMENT_COLUMNS)
+        required = df[self.REQUIRED_FIELDS]
+        missing = required.isna() | (required.astype(str).apply(lambda col: col.str.strip()) == '')
+
+        document_type_id = df['document_type'].map(self.doc_type_mapping)
+        date_of_birth = pd.to_datetime(df['date_of_birth'], errors='coerce').dt.date
+        expiry_date = pd.to_datetime(df['expiry_date'], errors='coerce').dt.date
+
+        # Срок действия необязателен: пустое значение пишется как NULL, а неразборчивое считается ошибкой
+        blank_expiry = df['expiry_date'].isna() | (df['expiry_date'].astype(str).str.strip() == '')
+
+        bad_doc_type = ~missing['document_type'] & document_type_id.isna()
+        bad_birth_date = ~missing['date_of_birth'] & date_of_birth.isna()
+        bad_expiry_date = ~blank_expiry & expiry_date.isna()
+        valid_mask = ~(missing.any(axis=1) | bad_doc_type | bad_birth_date | bad_expiry_date)
+
+        for index in df.index[~valid_mask]:
+            if missing.loc[index].any():
+                fields = ', '.join(missing.columns[missing.loc[index]])
+                stats['errors'].append(f"Отсутствуют обязательные поля у пассажира {df.at[index, 'first_name']}: {fields}")
+            elif bad_doc_type[index]:
+                stats['errors'].append(f"Неизвестный тип документа: {df.at[index, 'document_type']}")
+            elif bad_birth_date[index]:
+                stats['errors'].append(f"Неверная дата рождения: {df.at[index, 'date_of_birth']}")
+            else:
+                stats['errors'].append(f"Неверный срок действия документа: {df.at[index, 'expiry_date']}")
+
+        clean = df[valid_mask].assign(
+            document_type_id=document_type_id[valid_mask].astype(int),
+            document_number=df['document_number'][valid_mask].astype(str),
+            date_of_birth=date_of_birth[valid_mask],
+            expiry_date=expiry_date[valid_mask]
+        )
+        # Пустые строки и NaN в необязательных полях пишем в БД как NULL
+        clean = clean.astype(object).replace('', None)
+        clean = clean.where(clean.notna(), None)
+
+        # ID сгенерированы трансформером (на стороне Python), поэтому документы ссылаются на пассажира до вставки
+        if 'passenger_id' in valid_df:
+            clean['passenger_id'] = valid_df['passenger_id'][valid_mask]
+        else:
+            clean['passenger_id'] = [sequential_uuid() for _ in range(len(clean))]
+
+        # Одна метка времени создания на весь пакет
+        now = models.utcnow()
+        passenger_rows = (clean[['passenger_id'] + self.PASSENGER_COLUMNS]
+                          .assign(**models.insert_timestamps(models.Passenger, now)).to_dict('records'))
+        document_rows = (clean[['passenger_id', 'document_type_id'] + self.DOCUMENT_COLUMNS[1:]]
+                         .assign(**models.insert_timestamps(models.Passenger_Document, now)).to_dict('records'))
+
+        # Пакетная вставка: один executemany на таблицу вместо INSERT + refresh на каждую строку
+        self.db.bulk_insert_mappings(models.Passenger, passenger_rows)
+        self.db.bulk_insert_mappings(models.Passenger_Document, document_rows)
+        # commit=False: фиксацию выполняет вызывающий код (например, одной транзакцией на файл)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+
+        stats['passengers_created'] = len(passenger_rows)
+        stats['documents_created'] = len(document_rows)
 
-        for _, row in valid_df.iterrows():
-            try:
-                # Создаем пассажира
-                passenger_data = schemas.PassengerCreate(
-                    first_name=row['first_name'],
-                    last_name=row['last_name'],
-                    date_of_birth=row['date_of_birth'],
-                    email=row.get('email'),
-                    phone_number=row.get('phone_number')
-                )
-
-                passenger = crud.create_passenger(self.db, passenger_data)
-                stats['passengers_created'] += 1
-
-                # Создаем документ пассажира
-                document_type_id = doc_type_mapping.get(row['document_type'])
-                if not document_type_id:
-                    stats['errors'].append(f"Неизвестный тип документа: {row['document_type']}")
-                    continue
-
-                document_data = schemas.PassengerDocumentCreate(
-                    passenger_id=passenger.passenger_id,
-                    document_type_id=document_type_id,
-                    document_number=row['document_number'],
-                    expiry_date=row.get('expiry_date'),
-                    country_of_issue=row['country_of_issue']
-                )
-
-                crud.create_passenger_document(self.db, document_data)
-                stats['documents_created'] += 1
-
-            except Exception as e:
-                stats['errors'].append(f"Ошибка при создании пассажира {row.get('first_name', '')}: {str(e)}")
-
-        self.db.commit()
         logger.info(f"Загрузка пассажиров завершена: {stats}")
         return stats
 
@@ -118,36 +182,63 @@ class PassengerDataLoader(DataLoader):
 class FlightDataLoader(DataLoader):
     """Загрузчик данных рейсов"""
 
-    def load_flight_data(self, valid_df: pd.DataFrame, source_file: str) -> Dict[str, Any]:
-        """Загрузка данных рейсов в БД"""
+    def load_flight_data(self, valid_df: pd.DataFrame, source_file: str, commit: bool = True) -> Dict[str, Any]:
+        """Загрузка данных рейсов в БД (повторная загрузка обновляет существующие рейсы)"""
         stats = {
             'total_processed': len(valid_df),
             'flights_created': 0,
+            'flights_updated': 0,
             'errors': []
         }
 
         flight_mapping = {}  # flight_number -> flight_id
 
-        for _, row in valid_df.iterrows():
+        flights = []
+        for row in valid_df.itertuples(index=False):
             try:
-                flight_data = schemas.FlightCreate(
-                    flight_number=row['flight_number'],
-                    departure_airport_code=row['departure_airport_code'],
-                    arrival_airport_code=row['arrival_airport_code'],
-                    scheduled_departure=row['scheduled_departure'],
-                    scheduled_arrival=row['scheduled_arrival'],
-                    aircraft_type=row.get('aircraft_type'),
-                    total_seats=row['total_seats']
-                )
-
-                flight = crud.create_flight(self.db, flight_data)
-                flight_mapping[row['flight_number']] = flight.flight_id
-                stats['flights_created'] += 1
-
+                flights.append((getattr(row, 'flight_id', None), schemas.FlightCreate(
+                    flight_number=row.flight_number,
+                    departure_airport_code=row.departure_airport_code,
+                    arrival_airport_code=row.arrival_airport_code,
+                    scheduled_departure=row.scheduled_departure,
+                    scheduled_arrival=row.scheduled_arrival,
+                    aircraft_type=getattr(row, 'aircraft_type', None),
+                    total_seats=row.total_seats
+                )))
             except Exception as e:
-                stats['errors'].append(f"Ошибка при создании рейса {row.get('flight_number', '')}: {str(e)}")
+                stats['errors'].append(f"Ошибка при создании рейса {getattr(row, 'flight_number', '')}: {str(e)}")
+
+        # Рейс идентифицируется номером и временем вылета; уже существующие получаем одним запросом
+        existing = {
+            (flight.flight_number, flight.scheduled_departure): flight
+            for flight in crud.get_flights_by_numbers(self.db, {f.flight_number for _, f in flights})
+        }
+        new_rows = {}
+
+        for new_id, flight_data in flights:
+            key = (flight_data.flight_number, flight_data.scheduled_departure)
+            data = flight_data.model_dump()
+
+            if key in existing:
+                db_flight = existing[key]
+                for field, value in data.items():
+                    setattr(db_flight, field, value)
+                flight_mapping[flight_data.flight_number] = db_flight.flight_id
+                stats['flights_updated'] += 1
+            else:
+                # ID нового рейса берется из трансформера; повтор рейса внутри файла перезаписывает ранее подготовленную строку
+                flight_id = new_rows[key]['flight_id'] if key in new_rows else (new_id or sequential_uuid())
+                new_rows[key] = {'flight_id': flight_id, **data}
+                flight_mapping[flight_data.flight_number] = flight_id
+
+        stamps = models.insert_timestamps(models.Flight)
+        self.db.bulk_insert_mappings(models.Flight, [{**stamps, **row} for row in new_rows.values()])
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        stats['flights_created'] = len(new_rows)
 
-        self.db.commit()
         logger.info(f"Загрузка рейсов завершена: {stats}")
         return stats, flight_mapping
 
@@ -155,32 +246,52 @@ class FlightDataLoader(DataLoader):
 class FareDataLoader(DataLoader):
     """Загрузчик данных тарифов"""
 
-    def load_fare_data(self, valid_df: pd.DataFrame, flight_mapping: Dict[str, str], source_file: str) -> Dict[
-        str, Any]:
+    FARE_COLUMNS = ['flight_id', 'fare_class', 'price', 'fare_conditions', 'available_seats']
+
+    def load_fare_data(self, valid_df: pd.DataFrame, flight_mapping: Dict[str, str], source_file: str,
+                       commit: bool = True) -> Dict[str, Any]:
         """Загрузка данных тарифов в БД"""
         stats = {
             'total_processed': len(valid_df),
             'fares_created': 0,
+            'fares_updated': 0,
             'errors': []
         }
 
-        for _, row in valid_df.iterrows():
-            try:
-                fare_data = schemas.FareCreate(
-                    flight_id=row['flight_id'],
-                    fare_class=row['fare_class'],
-                    price=row['price'],
-                    fare_conditions=row.get('fare_conditions'),
-                    available_seats=row['available_seats']
-                )
-
-                crud.create_fare(self.db, fare_data)
-                stats['fares_created'] += 1
-
-            except Exception as e:
-                stats['errors'].append(f"Ошибка при создании тарифа: {str(e)}")
+        # Значения уже проверены трансформером: одна пакетная вставка вместо INSERT на каждый тариф
+        fares = valid_df.reindex(columns=self.FARE_COLUMNS).astype(object)
+        fares = fares.where(fares.notna(), None)
+        # ID тарифов сгенерированы трансформером
+        if 'fare_id' in valid_df:
+            fares.insert(0, 'fare_id', valid_df['fare_id'])
+        else:
+            fares.insert(0, 'fare_id', [sequential_uuid() for _ in range(len(fares))])
+        # Тариф идентифицируется рейсом и классом; повтор внутри файла заменяет предыдущую строку
+        fares = fares.drop_duplicates(subset=['flight_id', 'fare_class'], keep='last')
+
+        # Тарифы рейсов, загруженных ранее, обновляются на месте (на них могут ссылаться билеты)
+        existing = {
+            (fare.flight_id, fare.fare_class): fare
+            for fare in crud.get_fares_by_flight_ids(self.db, fares['flight_id'])
+        }
+        new_rows = []
+        for row in fares.to_dict('records'):
+            db_fare = existing.get((row['flight_id'], row['fare_class']))
+            if db_fare is None:
+                new_rows.append(row)
+                continue
+            for field in ('price', 'fare_conditions', 'available_seats'):
+                setattr(db_fare, field, row[field])
+            stats['fares_updated'] += 1
+
+        stamps = models.insert_timestamps(models.Fare)
+        self.db.bulk_insert_mappings(models.Fare, [{**stamps, **row} for row in new_rows])
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        stats['fares_created'] = len(new_rows)
 
-        self.db.commit()
         logger.info(f"Загрузка тарифов завершена: {stats}")
         return stats
 
@@ -191,6 +302,11 @@ class VisualizationEngine:
     @staticmethod
     def create_etl_dashboard(stats: Dict[str, Any], output_path: str):
         """Создание дашборда с результатами ETL"""
+        # matplotlib импортируется только при построении дашборда: импорт тяжелый, а GUI-бэкенд не нужен
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
         try:
             fig, axes = plt.subplots(2, 2, figsize=(15, 12))
             fig.suptitle('ETL Process Dashboard', fontsize=16)
@@ -202,7 +318,9 @@ class VisualizationEngine:
                 if 'total_processed' in data and data['total_processed'] > 0:
                     success_rate = (data.get('passengers_created', 0) +
                                     data.get('flights_created', 0) +
-                                    data.get('fares_created', 0)) / data['total_processed'] * 100
+                                    data.get('flights_updated', 0) +
+                                    data.get('fares_created', 0) +
+                                    data.get('fares_updated', 0)) / data['total_processed'] * 100
                     success_rates.append(success_rate)
                     labels.append(process)
 
@@ -1,21 +1,44 @@
 import os
 import sys
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from sqlalchemy.orm import Session
 
+try:
+    import orjson
+except ImportError:  # Без orjson отчет пишется стандартным json
+    orjson = None
+
 from app.database import SessionLocal
-from app.etl.extractors import PassengerDataExtractor, FlightDataExtractor
+from app.etl.extractors import PassengerDataExtractor, FlightDataExtractor, prefetch_chunks
 from app.etl.transformers import PassengerDataTransformer, FlightDataTransformer, FareDataTransformer
-from app.etl.loaders import PassengerDataLoader, FlightDataLoader, FareDataLoader, VisualizationEngine
+from app.etl.loaders import PassengerDataLoader, FlightDataLoader, FareDataLoader
 from config.etl_config import etl_config
 
 logger = logging.getLogger(__name__)
 
 
+def process_file_task(kind: str, file_path: str) -> Dict[str, Any]:
+    """Обработка одного файла в отдельном процессе со своей сессией БД"""
+    db = SessionLocal()
+    try:
+        orchestrator = ETLOrchestrator(db)
+        orchestrator.file_processors[kind](file_path)
+        return orchestrator.stats
+    finally:
+        db.close()
+
+
+def process_files_task(tasks: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Последовательная обработка группы файлов в одном процессе: статистика по каждому файлу"""
+    return [process_file_task(kind, file_path) for kind, file_path in tasks]
+
+
 class ETLOrchestrator:
     """Оркестратор ETL-процессов"""
 
@@ -41,40 +64,62 @@ class ETLOrchestrator:
             'fares': FareDataLoader(db)
         }
 
+        self.file_processors = {
+            'passengers': self.process_passengers_file,
+            'flights': self.process_flights_file
+        }
+
     def process_passengers_file(self, file_path: str):
         """Обработка файла с данными пассажиров"""
         logger.info(f"Начало обработки файла пассажиров: {file_path}")
 
         try:
-            # Extract
             extractor = self.extractors['passengers']
-            raw_data = extractor.extract_passengers_data(file_path)
-
-            # Transform
             transformer = self.transformers['passengers']
-            valid_data, errors_data = transformer.transform_passenger_data(raw_data)
-
-            # Load
             loader = self.loaders['passengers']
-            load_stats = loader.load_passenger_data(valid_data, file_path)
 
-            # Сохранение ошибок
-            if not errors_data.empty:
-                loader.save_errors_report(errors_data, file_path, 'passengers')
+            total_processed = 0
+            valid_records = 0
+            error_records = 0
+            load_stats = {}
+
+            # Extract -> Transform -> Load порциями, чтобы память не зависела от размера файла
+            # Следующая порция читается в фоновом потоке, пока текущая трансформируется и загружается
+            for raw_chunk in prefetch_chunks(extractor.stream_passengers_data(file_path)):
+                # Типы документов сверяются со справочником БД при трансформации, чтобы отклоненные строки попали в отчет
+                valid_chunk, errors_chunk = transformer.transform_passenger_data(
+                    raw_chunk, document_types=loader.doc_type_mapping.keys())
+                self._merge_stats(load_stats, loader.load_passenger_data(valid_chunk, file_path, commit=False))
+
+                # Ошибки порции сразу дописываются в отчет на диске
+                loader.append_errors(errors_chunk, file_path, 'passengers')
+
+                total_processed += len(raw_chunk)
+                valid_records += len(valid_chunk)
+                error_records += len(errors_chunk)
+
+            # Все порции файла фиксируются одной транзакцией
+            self.db.commit()
+
+            # Сохранение сводки по ошибкам
+            loader.finalize_errors_report('passengers')
 
             # Статистика
-            self.stats['passengers'] = {
-                'total_processed': len(raw_data),
-                'valid_records': len(valid_data),
-                'error_records': len(errors_data),
-                **load_stats
-            }
+            self._record_stats('passengers', {
+                **load_stats,
+                'total_processed': total_processed,
+                'valid_records': valid_records,
+                'error_records': error_records
+            })
 
-            logger.info(f"Обработка пассажиров завершена: {len(valid_data)} успешно, {len(errors_data)} с ошибками")
+            logger.info(f"Обработка пассажиров завершена: {valid_records} успешно, {error_records} с ошибками")
 
         except Exception as e:
+            self.db.rollback()
+            # Закрываем отчет об ошибках, чтобы следующий файл не дописывал в него
+            self.loaders['passengers'].finalize_errors_report('passengers')
             logger.error(f"Ошибка при обработке файла пассажиров {file_path}: {str(e)}")
-            self.stats['passengers'] = {'error': str(e)}
+            self._record_stats('passengers', {'error': str(e)})
 
     def process_flights_file(self, file_path: str):
         """Обработка файла с данными рейсов и тарифов"""
@@ -89,9 +134,9 @@ class ETLOrchestrator:
             valid_flights, errors_flights = transformer.transform_flight_data(raw_flights)
 
             loader = self.loaders['flights']
-            load_stats_flights, flight_mapping = loader.load_flight_data(valid_flights, file_path)
+            load_stats_flights, flight_mapping = loader.load_flight_data(valid_flights, file_path, commit=False)
 
-            if not errors_flights.empty:
+            if len(errors_flights):
                 loader.save_errors_report(errors_flights, file_path, 'flights')
 
             # Обработка тарифов
@@ -100,32 +145,36 @@ class ETLOrchestrator:
             valid_fares, errors_fares = transformer_fares.transform_fare_data(raw_fares, flight_mapping)
 
             loader_fares = self.loaders['fares']
-            load_stats_fares = loader_fares.load_fare_data(valid_fares, flight_mapping, file_path)
+            load_stats_fares = loader_fares.load_fare_data(valid_fares, flight_mapping, file_path, commit=False)
+
+            # Рейсы и тарифы файла фиксируются одной транзакцией
+            self.db.commit()
 
-            if not errors_fares.empty:
+            if len(errors_fares):
                 loader_fares.save_errors_report(errors_fares, file_path, 'fares')
 
             # Статистика
-            self.stats['flights'] = {
+            self._record_stats('flights', {
+                **load_stats_flights,
                 'total_processed': len(raw_flights),
                 'valid_records': len(valid_flights),
-                'error_records': len(errors_flights),
-                **load_stats_flights
-            }
+                'error_records': len(errors_flights)
+            })
 
-            self.stats['fares'] = {
+            self._record_stats('fares', {
+                **load_stats_fares,
                 'total_processed': len(raw_fares),
                 'valid_records': len(valid_fares),
-                'error_records': len(errors_fares),
-                **load_stats_fares
-            }
+                'error_records': len(errors_fares)
+            })
 
             logger.info(f"Обработка рейсов завершена: {len(valid_flights)} рейсов, {len(valid_fares)} тарифов")
 
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Ошибка при обработке файла рейсов {file_path}: {str(e)}")
-            self.stats['flights'] = {'error': str(e)}
-            self.stats['fares'] = {'error': str(e)}
+            self._record_stats('flights', {'error': str(e)})
+            self._record_stats('fares', {'error': str(e)})
 
     def run_etl_pipeline(self):
         """Запуск полного ETL-конвейера"""
@@ -139,16 +188,17 @@ class ETLOrchestrator:
             logger.warning("Нет файлов для обработки")
             return
 
-        # Обрабатываем каждый файл
-        for file in files:
-            logger.info(f"Обработка файла: {file}")
+        # Определяем тип каждого файла
+        tasks = self._classify_files(files)
 
-            if 'passenger' in file.lower():
-                self.process_passengers_file(file)
-            elif 'flight' in file.lower():
-                self.process_flights_file(file)
-            else:
-                logger.warning(f"Неизвестный тип файла: {file}")
+        # Группы файлов независимы друг от друга, поэтому обрабатываются параллельно в отдельных процессах
+        groups = self._group_tasks(tasks)
+        if len(groups) > 1:
+            self._process_files_parallel(groups)
+        else:
+            for kind, file in tasks:
+                logger.info(f"Обработка файла: {file}")
+                self.file_processors[kind](file)
 
         # Визуализация результатов
         self._create_visualizations()
@@ -158,9 +208,73 @@ class ETLOrchestrator:
 
         logger.info("ETL-конвейер завершен")
 
+    @staticmethod
+    def _merge_stats(total: Dict[str, Any], chunk_stats: Dict[str, Any]):
+        """Суммирование статистики загрузки по порциям (и по файлам одного типа)"""
+        for key, value in chunk_stats.items():
+            if isinstance(value, list):
+                total.setdefault(key, []).extend(value)
+            elif isinstance(value, str):
+                # Сообщения (например, об ошибке файла) накапливаются списком
+                total.setdefault(key, []).append(value)
+            else:
+                total[key] = total.get(key, 0) + value
+
+    def _record_stats(self, kind: str, file_stats: Dict[str, Any]):
+        """Добавление статистики файла к общей статистике его типа"""
+        self._merge_stats(self.stats.setdefault(kind, {}), file_stats)
+
+    @staticmethod
+    def _classify_files(files: List[str]) -> List[Tuple[str, str]]:
+        """Разбивка файлов по типам: (тип, путь)"""
+        tasks = []
+        for file in files:
+            if 'passenger' in file.lower():
+                tasks.append(('passengers', file))
+            elif 'flight' in file.lower():
+                tasks.append(('flights', file))
+            else:
+                logger.warning(f"Неизвестный тип файла: {file}")
+        return tasks
+
+    @staticmethod
+    def _group_tasks(tasks: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Группировка файлов для параллельной обработки"""
+        # Файлы пассажиров независимы; файлы рейсов обновляют общие рейсы и тарифы
+        # (поиск существующих по номеру и времени вылета), поэтому идут одной группой последовательно
+        groups = [[task] for task in tasks if task[0] == 'passengers']
+        flight_tasks = [task for task in tasks if task[0] == 'flights']
+        if flight_tasks:
+            groups.append(flight_tasks)
+        return groups
+
+    def _process_files_parallel(self, groups: List[List[Tuple[str, str]]]):
+        """Параллельная обработка групп файлов в пуле процессов"""
+        max_workers = min(len(groups), os.cpu_count() or 1)
+        # spawn: дочерние процессы создают свой engine и логирование, а не наследуют соединения родителя
+        mp_context = multiprocessing.get_context('spawn')
+
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+            futures = {
+                executor.submit(process_files_task, group): [file for _, file in group]
+                for group in groups
+            }
+            for future in as_completed(futures):
+                files = futures[future]
+                try:
+                    for file_stats in future.result():
+                        for kind, kind_stats in file_stats.items():
+                            self._record_stats(kind, kind_stats)
+                    logger.info(f"Файлы обработаны: {', '.join(files)}")
+                except Exception as e:
+                    logger.error(f"Ошибка при обработке файлов {', '.join(files)}: {str(e)}")
+
     def _create_visualizations(self):
         """Создание визуализаций"""
         try:
+            # Визуализация (и matplotlib за ней) нужна только здесь, поэтому импортируется по требованию
+            from app.etl.loaders import VisualizationEngine
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             dashboard_path = os.path.join(etl_config.OUTPUT_DIR, f"etl_dashboard_{timestamp}.png")
 
@@ -181,8 +295,15 @@ class ETLOrchestrator:
                 'summary': self._generate_summary()
             }
 
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                with open(report_path, 'wb') as f:
+                    f.write(orjson.dumps(
+                        report,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    ))
+            else:
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
 
             logger.info(f"Итоговый отчет сохранен: {report_path}")
 
@@ -1,15 +1,24 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Iterable, Optional
 import logging
-from datetime import datetime
-import uuid
+import os
+from datetime import date, datetime
+from uuid import UUID
 
-from app.etl.validators import PassengerValidator, FlightValidator
+from app.ids import reserve_id_sequence, sequential_uuid
+from app.etl.validators import DataValidator, PassengerValidator, FlightValidator
 from config.etl_config import etl_config
 
 logger = logging.getLogger(__name__)
 
+# Текстовые столбцы храним в Arrow: строковые операции выполняются нативными ядрами pyarrow
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TEXT_DTYPE = 'string'
+
 
 class DataTransformer:
     """Базовый класс для трансформации данных"""
@@ -23,9 +32,37 @@ class DataTransformer:
             return ''
         return str(text).strip()
 
+    def clean_text_columns(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Очистка текстовых столбцов целиком: пропуски -> '', обрезка пробелов (изменяет df на месте)"""
+        for col in [col for col in columns if col in df.columns]:
+            df[col] = df[col].astype(TEXT_DTYPE).fillna('').str.strip()
+        return df
+
     def generate_uuid(self) -> str:
         """Генерация UUID"""
-        return str(uuid.uuid4())
+        return str(sequential_uuid())
+
+    @staticmethod
+    def generate_uuids(n: int) -> np.ndarray:
+        """Пакетная генерация n последовательных UUID (раскладка sequential_uuid); загрузчики вставляют их как есть"""
+        raw = np.frombuffer(os.urandom(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+        raw[:, 6] = (raw[:, 6] & 0x0F) | 0x80
+        # Байты 8-9: вариант RFC 4122 + счетчик, байты 10-15: метка времени в мс (по ним сортирует SQL Server)
+        sequence = np.uint64(reserve_id_sequence(n)) + np.arange(n, dtype=np.uint64)
+        counter = (sequence & np.uint64(0x3FFF)) | np.uint64(0x8000)
+        raw[:, 8:10] = counter.astype('>u2').view(np.uint8).reshape(n, 2)
+        raw[:, 10:16] = (sequence >> np.uint64(14)).astype('>u8').view(np.uint8).reshape(n, 8)[:, 2:]
+        data = raw.tobytes()
+        return np.array([UUID(bytes=data[i:i + 16]) for i in range(0, 16 * n, 16)], dtype=object)
+
+    @staticmethod
+    def map_codes(values: pd.Series, mapping: Dict[str, str]) -> pd.Series:
+        """
+        Приведение кодов к верхнему регистру и замена по маппингу (неизвестные коды остаются как есть).
+        Столбец переводится в category, поэтому маппинг применяется только к уникальным значениям
+        """
+        codes = values.astype(str).str.upper().astype('category')
+        return codes.map(lambda code: mapping.get(code, code)).astype('category')
 
 
 class PassengerDataTransformer(DataTransformer):
@@ -35,83 +72,82 @@ class PassengerDataTransformer(DataTransformer):
         super().__init__()
         self.validator = PassengerValidator()
 
-    def transform_passenger_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    TEXT_COLUMNS = ['first_name', 'last_name', 'email', 'phone_number',
+                    'document_type', 'document_number', 'country_of_issue']
+
+    def transform_passenger_data(self, df: pd.DataFrame,
+                                 document_types: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Трансформация данных пассажиров
+        Трансформация данных пассажиров (по столбцам, без обхода строк)
+        document_types - известные коды типов документов (из справочника БД); строки с другими кодами - ошибки
         Возвращает: (валидные данные, данные с ошибками)
         """
-        valid_rows = []
-        error_rows = []
-
-        for index, row in df.iterrows():
-            # Очистка текстовых полей
-            cleaned_row = row.copy()
-            for col in ['first_name', 'last_name', 'email', 'phone_number',
-                        'document_type', 'document_number', 'country_of_issue']:
-                if col in cleaned_row:
-                    cleaned_row[col] = self.clean_text(cleaned_row[col])
-
-            # Валидация
-            is_valid, errors = self.validator.validate_passenger_row(cleaned_row)
-
-            if is_valid:
-                # Трансформация валидных данных
-                transformed_row = self._transform_valid_passenger(cleaned_row)
-                valid_rows.append(transformed_row)
-            else:
-                # Сохранение ошибок
-                error_row = cleaned_row.to_dict()
-                error_row['_errors'] = errors
-                error_row['_original_index'] = index
-                error_rows.append(error_row)
-
-        valid_df = pd.DataFrame(valid_rows) if valid_rows else pd.DataFrame()
-        errors_df = pd.DataFrame(error_rows) if error_rows else pd.DataFrame()
+        cleaned = df.copy()
+
+        # Очистка текстовых полей
+        self.clean_text_columns(cleaned, self.TEXT_COLUMNS)
+
+        # Валидация
+        # Текущая дата фиксируется один раз на весь набор
+        errors = self.validator.validate_passenger_df(cleaned, today=date.today())
+        if document_types is not None and 'document_type' in cleaned:
+            # Пустой тип уже учтен в обязательных полях
+            codes = self.map_codes(cleaned['document_type'], etl_config.DOCUMENT_TYPE_MAPPING)
+            unknown = (cleaned['document_type'] != '') & ~codes.isin(list(document_types))
+            errors = errors + self.validator.collect_errors(
+                cleaned.index, [(unknown, "Неизвестный тип документа: " + codes.astype(str))])
+        valid_mask = errors.str.len() == 0
+
+        # Трансформация валидных данных
+        valid_df = self._transform_valid_passengers(cleaned[valid_mask])
+
+        # Сохранение ошибок
+        errors_df = cleaned[~valid_mask].copy()
+        errors_df['_errors'] = errors[~valid_mask]
+        errors_df['_original_index'] = errors_df.index
+        errors_df = errors_df.reset_index(drop=True)
 
         logger.info(f"Трансформация пассажиров завершена: {len(valid_df)} валидных, {len(errors_df)} с ошибками")
         return valid_df, errors_df
 
-    def _transform_valid_passenger(self, row: pd.Series) -> Dict[str, Any]:
-        """Трансформация валидной строки пассажира"""
-        transformed = {}
+    def _transform_valid_passengers(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Трансформация валидных строк пассажиров"""
+        transformed = pd.DataFrame(index=df.index)
 
         # Генерация ID если не указан
-        if 'passenger_id' in row and not pd.isna(row['passenger_id']):
-            transformed['passenger_id'] = row['passenger_id']
+        new_ids = pd.Series(self.generate_uuids(len(df)), index=df.index, dtype=object)
+        if 'passenger_id' in df:
+            # Формат переданных ID уже проверен валидатором
+            provided = df['passenger_id'].map(lambda value: UUID(str(value)), na_action='ignore')
+            transformed['passenger_id'] = provided.where(provided.notna(), new_ids)
         else:
-            transformed['passenger_id'] = self.generate_uuid()
+            transformed['passenger_id'] = new_ids
 
-        # Базовые поля
-        transformed['first_name'] = row['first_name']
-        transformed['last_name'] = row['last_name']
-        transformed['date_of_birth'] = row['date_of_birth']
-        transformed['email'] = row.get('email')
-        transformed['phone_number'] = row.get('phone_number')
+        # Базовые поля (даты берем уже разобранными при валидации)
+        parsed_dates = self.validator.parsed_dates
+        for col in ['first_name', 'last_name', 'date_of_birth', 'email', 'phone_number']:
+            if col in parsed_dates:
+                transformed[col] = parsed_dates[col].loc[df.index]
+            else:
+                transformed[col] = df[col] if col in df else None
 
         # Трансформация типа документа
-        doc_type = self.clean_text(row.get('document_type', ''))
-        transformed['document_type'] = etl_config.DOCUMENT_TYPE_MAPPING.get(
-            doc_type.upper(), doc_type.upper()
-        )
+        transformed['document_type'] = self.map_codes(df['document_type'], etl_config.DOCUMENT_TYPE_MAPPING)
 
         # Данные документа
-        transformed['document_number'] = row['document_number']
-        transformed['expiry_date'] = row.get('expiry_date')
-        transformed['country_of_issue'] = row['country_of_issue']
+        transformed['document_number'] = df['document_number']
+        transformed['expiry_date'] = parsed_dates['expiry_date'].loc[df.index] if 'expiry_date' in parsed_dates else None
+        transformed['country_of_issue'] = df['country_of_issue']
 
         # Дополнительные поля для связывания
-        if 'flight_number' in row:
-            transformed['flight_number'] = row['flight_number']
-        if 'fare_class' in row:
-            transformed['fare_class'] = etl_config.FARE_CLASS_MAPPING.get(
-                row['fare_class'].upper(), row['fare_class'].upper()
-            )
-        if 'booking_status' in row:
-            transformed['booking_status'] = etl_config.BOOKING_STATUS_MAPPING.get(
-                row['booking_status'].upper(), row['booking_status'].upper()
-            )
+        if 'flight_number' in df:
+            transformed['flight_number'] = df['flight_number']
+        if 'fare_class' in df:
+            transformed['fare_class'] = self.map_codes(df['fare_class'], etl_config.FARE_CLASS_MAPPING)
+        if 'booking_status' in df:
+            transformed['booking_status'] = self.map_codes(df['booking_status'], etl_config.BOOKING_STATUS_MAPPING)
 
-        return transformed
+        return transformed.reset_index(drop=True)
 
 
 class FlightDataTransformer(DataTransformer):
@@ -121,132 +157,142 @@ class FlightDataTransformer(DataTransformer):
         super().__init__()
         self.validator = FlightValidator()
 
+    TEXT_COLUMNS = ['flight_number', 'departure_airport_code', 'arrival_airport_code', 'aircraft_type']
+
     def transform_flight_data(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Трансформация данных рейсов"""
-        valid_rows = []
-        error_rows = []
-
-        for index, row in df.iterrows():
-            # Очистка данных
-            cleaned_row = row.copy()
-            for col in ['flight_number', 'departure_airport_code', 'arrival_airport_code', 'aircraft_type']:
-                if col in cleaned_row:
-                    cleaned_row[col] = self.clean_text(cleaned_row[col])
-
-            # Валидация
-            is_valid, errors = self.validator.validate_flight_row(cleaned_row)
-
-            if is_valid:
-                transformed_row = self._transform_valid_flight(cleaned_row)
-                valid_rows.append(transformed_row)
-            else:
-                error_row = cleaned_row.to_dict()
-                error_row['_errors'] = errors
-                error_row['_original_index'] = index
-                error_rows.append(error_row)
+        """Трансформация данных рейсов (по столбцам, без обхода строк)"""
+        cleaned = df.copy()
+
+        # Очистка текстовых полей
+        self.clean_text_columns(cleaned, self.TEXT_COLUMNS)
 
-        valid_df = pd.DataFrame(valid_rows) if valid_rows else pd.DataFrame()
-        errors_df = pd.DataFrame(error_rows) if error_rows else pd.DataFrame()
+        # Валидация
+        errors = self.validator.validate_flight_df(cleaned)
+        valid_mask = errors.str.len() == 0
+
+        # Трансформация валидных данных
+        valid_df = self._transform_valid_flights(cleaned[valid_mask])
+
+        # Сохранение ошибок
+        errors_df = cleaned[~valid_mask].copy()
+        errors_df['_errors'] = errors[~valid_mask]
+        errors_df['_original_index'] = errors_df.index
+        errors_df = errors_df.reset_index(drop=True)
 
         logger.info(f"Трансформация рейсов завершена: {len(valid_df)} валидных, {len(errors_df)} с ошибками")
         return valid_df, errors_df
 
-    def _transform_valid_flight(self, row: pd.Series) -> Dict[str, Any]:
-        """Трансформация валидной строки рейса"""
-        transformed = {}
+    def _transform_valid_flights(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Трансформация валидных строк рейсов"""
+        transformed = pd.DataFrame(index=df.index)
 
         # Генерация ID
-        transformed['flight_id'] = self.generate_uuid()
+        transformed['flight_id'] = self.generate_uuids(len(df))
 
         # Базовые поля
-        transformed['flight_number'] = row['flight_number'].upper()
-        transformed['departure_airport_code'] = row['departure_airport_code'].upper()
-        transformed['arrival_airport_code'] = row['arrival_airport_code'].upper()
-        transformed['scheduled_departure'] = row['scheduled_departure']
-        transformed['scheduled_arrival'] = row['scheduled_arrival']
-        transformed['aircraft_type'] = row.get('aircraft_type')
-        transformed['total_seats'] = int(row['total_seats'])
+        transformed['flight_number'] = df['flight_number'].str.upper()
+        transformed['departure_airport_code'] = df['departure_airport_code'].str.upper()
+        transformed['arrival_airport_code'] = df['arrival_airport_code'].str.upper()
+        # Даты берем уже разобранными при валидации
+        parsed_dates = self.validator.parsed_dates
+        transformed['scheduled_departure'] = parsed_dates['scheduled_departure'].loc[df.index]
+        transformed['scheduled_arrival'] = parsed_dates['scheduled_arrival'].loc[df.index]
+        transformed['aircraft_type'] = df['aircraft_type'] if 'aircraft_type' in df else None
+        transformed['total_seats'] = pd.to_numeric(df['total_seats']).astype(np.int32)
 
-        return transformed
+        return transformed.reset_index(drop=True)
 
 
 class FareDataTransformer(DataTransformer):
     """Трансформатор данных тарифов"""
 
+    TEXT_COLUMNS = ['fare_class', 'fare_conditions']
+    REQUIRED_FIELDS = ['flight_number', 'fare_class', 'price', 'available_seats']
+
     def transform_fare_data(self, df: pd.DataFrame, flight_mapping: Dict[str, str]) -> Tuple[
         pd.DataFrame, pd.DataFrame]:
-        """Трансформация данных тарифов"""
-        valid_rows = []
-        error_rows = []
+        """Трансформация данных тарифов (по столбцам, без обхода строк)"""
+        cleaned = df.copy()
 
-        for index, row in df.iterrows():
-            cleaned_row = row.copy()
+        # Очистка
+        self.clean_text_columns(cleaned, self.TEXT_COLUMNS)
 
-            # Очистка
-            for col in ['fare_class', 'fare_conditions']:
-                if col in cleaned_row:
-                    cleaned_row[col] = self.clean_text(cleaned_row[col])
+        # Привязка к рейсам: поиск по хэш-индексу Series вместо словаря на каждой строке
+        if 'flight_number' in cleaned:
+            flight_numbers = cleaned['flight_number'].astype(TEXT_DTYPE).fillna('').str.strip()
+        else:
+            flight_numbers = pd.Series('', index=cleaned.index, dtype=TEXT_DTYPE)
+        flight_ids = flight_numbers.str.upper().map(pd.Series(flight_mapping, dtype=object))
+
+        prices, bad_price, seats = self._parse_fare_numeric(cleaned)
+
+        # Валидация
+        errors = self._validate_fare_df(cleaned, flight_numbers, flight_ids, prices, bad_price, seats)
+        valid_mask = (errors.str.len() == 0).to_numpy()
+
+        # Трансформация валидных данных
+        valid = cleaned[valid_mask]
+        valid_df = pd.DataFrame({
+            'fare_id': self.generate_uuids(len(valid)),
+            'flight_id': flight_ids[valid_mask].to_numpy(),
+            'fare_class': self.map_codes(valid.get('fare_class', pd.Series(dtype=object)),
+                                         etl_config.FARE_CLASS_MAPPING).to_numpy(),
+            'price': prices[valid_mask],
+            'fare_conditions': valid['fare_conditions'].to_numpy() if 'fare_conditions' in valid else None,
+            'available_seats': np.trunc(seats[valid_mask]).astype(np.int64)
+        })
+        valid_df['fare_class'] = valid_df['fare_class'].astype('category')
+
+        # Сохранение ошибок
+        errors_df = cleaned[~valid_mask].copy()
+        errors_df['_errors'] = errors[~valid_mask]
+        errors_df['_original_index'] = errors_df.index
+        errors_df = errors_df.reset_index(drop=True)
+
+        logger.info(f"Трансформация тарифов завершена: {len(valid_df)} валидных, {len(errors_df)} с ошибками")
+        return valid_df, errors_df
 
-            errors = self._validate_fare_row(cleaned_row, flight_mapping)
+    @staticmethod
+    def _parse_fare_numeric(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Разбор цены и количества мест в массивы NumPy: (цены, маска нечисловых цен, места)"""
+        n = len(df)
 
-            if not errors:
-                transformed_row = self._transform_valid_fare(cleaned_row, flight_mapping)
-                valid_rows.append(transformed_row)
-            else:
-                error_row = cleaned_row.to_dict()
-                error_row['_errors'] = errors
-                error_row['_original_index'] = index
-                error_rows.append(error_row)
+        # Цена: пропуск допустим (отмечается как отсутствующее поле), нечисловое значение - ошибка формата
+        if 'price' in df:
+            prices = pd.to_numeric(df['price'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            bad_price = np.isnan(prices) & df['price'].notna().to_numpy()
+        else:
+            prices = np.zeros(n)
+            bad_price = np.zeros(n, dtype=bool)
 
-        valid_df = pd.DataFrame(valid_rows) if valid_rows else pd.DataFrame()
-        errors_df = pd.DataFrame(error_rows) if error_rows else pd.DataFrame()
+        # Количество мест: пропуск не приводится к целому, поэтому тоже ошибка формата
+        if 'available_seats' in df:
+            seats = pd.to_numeric(df['available_seats'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            seats = np.zeros(n)
 
-        logger.info(f"Трансформация тарифов завершена: {len(valid_df)} валидных, {len(errors_df)} с ошибками")
-        return valid_df, errors_df
+        return prices, bad_price, seats
 
-    def _validate_fare_row(self, row: pd.Series, flight_mapping: Dict[str, str]) -> List[str]:
-        """Валидация строки тарифа"""
-        errors = []
+    def _validate_fare_df(self, df: pd.DataFrame, flight_numbers: pd.Series, flight_ids: pd.Series,
+                          prices: np.ndarray, bad_price: np.ndarray, seats: np.ndarray) -> pd.Series:
+        """Валидация тарифов сразу по всем строкам; возвращает списки ошибок по строкам"""
+        checks = []
 
-        required_fields = ['flight_number', 'fare_class', 'price', 'available_seats']
-        for field in required_fields:
-            if field not in row or pd.isna(row[field]):
-                errors.append(f"Отсутствует обязательное поле: {field}")
+        for field in self.REQUIRED_FIELDS:
+            missing = df[field].isna() if field in df else pd.Series(True, index=df.index)
+            checks.append((missing, f"Отсутствует обязательное поле: {field}"))
 
         # Проверка существования рейса
-        flight_number = self.clean_text(row.get('flight_number', ''))
-        if flight_number and flight_number not in flight_mapping:
-            errors.append(f"Рейс не найден: {flight_number}")
-
-        # Проверка цены
-        try:
-            price = float(row.get('price', 0))
-            if price < 0:
-                errors.append("Цена не может быть отрицательной")
-        except (ValueError, TypeError):
-            errors.append("Неверный формат цены")
-
-        # Проверка количества мест
-        try:
-            seats = int(row.get('available_seats', 0))
-            if seats < 0:
-                errors.append("Количество мест не может быть отрицательным")
-        except (ValueError, TypeError):
-            errors.append("Неверный формат количества мест")
-
-        return errors
-
-    def _transform_valid_fare(self, row: pd.Series, flight_mapping: Dict[str, str]) -> Dict[str, Any]:
-        """Трансформация валидной строки тарифа"""
-        transformed = {}
-
-        transformed['fare_id'] = self.generate_uuid()
-        transformed['flight_id'] = flight_mapping[self.clean_text(row['flight_number']).upper()]
-        transformed['fare_class'] = etl_config.FARE_CLASS_MAPPING.get(
-            row['fare_class'].upper(), row['fare_class'].upper()
-        )
-        transformed['price'] = float(row['price'])
-        transformed['fare_conditions'] = row.get('fare_conditions')
-        transformed['available_seats'] = int(row['available_seats'])
-
-        return transformed
\ No newline at end of file
+        not_found = (flight_numbers != '') & flight_ids.isna()
+        checks.append((not_found, "Рейс не найден: " + flight_numbers))
+
+        # Проверка цены и количества мест
+        with np.errstate(invalid='ignore'):
+            checks += [
+                (pd.Series(prices < 0, index=df.index), "Цена не может быть отрицательной"),
+                (pd.Series(bad_price, index=df.index), "Неверный формат цены"),
+                (pd.Series(np.trunc(seats) < 0, index=df.index), "Количество мест не может быть отрицательным"),
+                (pd.Series(np.isnan(seats), index=df.index), "Неверный формат количества мест"),
+            ]
+
+        return DataValidator.collect_errors(df.index, checks)
@@ -1,12 +1,16 @@
 import pandas as pd
+import numpy as np
 import re
 from datetime import datetime, date
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Union
 import logging
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_RE = re.compile(r'^[\+]?[0-9\s\-\(\)]{10,15}$')
+
 
 class DataValidator:
     """Класс для валидации данных"""
@@ -16,16 +20,29 @@ class DataValidator:
         """Валидация email"""
         if pd.isna(email):
             return True  # Email опциональный
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, str(email)))
+        return bool(EMAIL_RE.match(str(email)))
 
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Валидация номера телефона"""
         if pd.isna(phone):
             return True  # Телефон опциональный для пассажира
-        pattern = r'^[\+]?[0-9\s\-\(\)]{10,15}$'
-        return bool(re.match(pattern, str(phone)))
+        return bool(PHONE_RE.match(str(phone)))
+
+    @staticmethod
+    def _as_text(values: pd.Series) -> pd.Series:
+        """Строковое представление столбца; столбцы string-типа (в т.ч. Arrow) не конвертируются"""
+        return values if isinstance(values.dtype, pd.StringDtype) else values.astype(str)
+
+    @classmethod
+    def validate_email_series(cls, emails: pd.Series) -> pd.Series:
+        """Валидация столбца email (пропуск считается валидным)"""
+        return emails.isna() | DataValidator._as_text(emails).str.match(EMAIL_RE.pattern)
+
+    @classmethod
+    def validate_phone_series(cls, phones: pd.Series) -> pd.Series:
+        """Валидация столбца номеров телефонов (пропуск считается валидным)"""
+        return phones.isna() | DataValidator._as_text(phones).str.match(PHONE_RE.pattern)
 
     @staticmethod
     def validate_date(date_str: str, date_format: str = '%Y-%m-%d') -> bool:
@@ -39,13 +56,13 @@ class DataValidator:
             return False
 
     @staticmethod
-    def validate_future_date(date_str: str, date_format: str = '%Y-%m-%d') -> bool:
+    def validate_future_date(date_str: str, date_format: str = '%Y-%m-%d', today: Optional[date] = None) -> bool:
         """Проверка что дата в будущем (для expiry_date)"""
         if pd.isna(date_str):
             return True
         try:
             parsed_date = datetime.strptime(str(date_str), date_format).date()
-            return parsed_date > date.today()
+            return parsed_date > (today or date.today())
         except (ValueError, TypeError):
             return False
 
@@ -61,7 +78,19 @@ class DataValidator:
             return False
 
     @staticmethod
-    def validate_required_fields(row: pd.Series, required_fields: List[str]) -> List[str]:
+    def collect_errors(index: pd.Index, checks: List[Tuple[pd.Series, Any]]) -> pd.Series:
+        """
+        Сборка списков ошибок по строкам из булевых масок проверок.
+        Сообщение - строка или Series с текстом для каждой строки; Python-цикл идет только по ошибочным строкам
+        """
+        errors = pd.Series([[] for _ in range(len(index))], index=index, dtype=object)
+        for mask, message in checks:
+            for idx in index[mask.to_numpy(dtype=bool)]:
+                errors[idx].append(message if isinstance(message, str) else message[idx])
+        return errors
+
+    @staticmethod
+    def validate_required_fields(row: Union[pd.Series, Dict[str, Any]], required_fields: List[str]) -> List[str]:
         """Проверка обязательных полей"""
         missing_fields = []
         for field in required_fields:
@@ -69,6 +98,28 @@ class DataValidator:
                 missing_fields.append(field)
         return missing_fields
 
+    @staticmethod
+    def _null_like(df: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+        """Таблица признаков пропуска по полям: NaN/None или пустая строка (отсутствующий столбец - пропуск)"""
+        values = df.reindex(columns=fields)
+        blank = values.astype('string').apply(lambda col: col.str.strip().str.len() == 0)
+        return values.isna() | blank.fillna(False).astype(bool)
+
+    @classmethod
+    def required_mask(cls, df: pd.DataFrame, fields: List[str]) -> np.ndarray:
+        """Маска строк, в которых не заполнено хотя бы одно обязательное поле"""
+        return cls._null_like(df, fields).any(axis=1).to_numpy()
+
+    @classmethod
+    def missing_fields_check(cls, df: pd.DataFrame, required_fields: List[str]) -> Tuple[pd.Series, pd.Series]:
+        """Проверка обязательных полей по столбцам: маска строк с пропусками и текст ошибки для них"""
+        null_like = cls._null_like(df, required_fields)
+        missing_mask = null_like.any(axis=1)
+        # Перечень пропущенных полей для каждой строки одним матричным произведением
+        missing_fields = null_like[missing_mask].dot(pd.Index([f"{field}, " for field in required_fields]))
+        missing_message = "Отсутствуют обязательные поля: " + missing_fields.str[:-2]
+        return missing_mask, missing_message
+
 
 class PassengerValidator(DataValidator):
     """Специализированный валидатор для данных пассажиров"""
@@ -76,7 +127,7 @@ class PassengerValidator(DataValidator):
     REQUIRED_FIELDS = ['first_name', 'last_name', 'date_of_birth', 'document_type', 'document_number',
                        'country_of_issue']
 
-    def validate_passenger_row(self, row: pd.Series) -> Tuple[bool, List[str]]:
+    def validate_passenger_row(self, row: Union[pd.Series, Dict[str, Any]]) -> Tuple[bool, List[str]]:
         """Валидация строки с данными пассажира"""
         errors = []
 
@@ -107,6 +158,48 @@ class PassengerValidator(DataValidator):
 
         return len(errors) == 0, errors
 
+    def validate_passenger_df(self, df: pd.DataFrame, today: Optional[date] = None) -> pd.Series:
+        """
+        Валидация всего набора данных пассажиров по столбцам.
+        Возвращает Series со списком ошибок для каждой строки (пустой список - строка валидна)
+        """
+        checks = [self.missing_fields_check(df, self.REQUIRED_FIELDS)]
+        # Разобранные даты сохраняются для трансформации, чтобы не разбирать их повторно
+        self.parsed_dates = {}
+
+        # Дата рождения (пропуск уже учтен в обязательных полях)
+        if 'date_of_birth' in df:
+            birth = df['date_of_birth']
+            parsed_birth = pd.to_datetime(birth, format='%Y-%m-%d', errors='coerce')
+            self.parsed_dates['date_of_birth'] = parsed_birth
+            checks.append((birth.notna() & parsed_birth.isna(), "Неверный формат даты рождения"))
+
+        # Email и телефон опциональны: пустое значение допустимо
+        if 'email' in df:
+            email = df['email'].mask(df['email'] == '')
+            checks.append((~self.validate_email_series(email), "Неверный формат email"))
+
+        if 'phone_number' in df:
+            phone = df['phone_number'].mask(df['phone_number'] == '')
+            checks.append((~self.validate_phone_series(phone), "Неверный формат номера телефона"))
+
+        # ID пассажира из файла необязателен, но если указан, должен быть UUID
+        if 'passenger_id' in df:
+            bad_id = ~df['passenger_id'].map(self.validate_uuid).astype(bool)
+            checks.append((bad_id, "Неверный формат passenger_id"))
+
+        # Срок действия документа: формат и то, что документ не просрочен
+        if 'expiry_date' in df:
+            expiry = df['expiry_date']
+            present = expiry.notna() & (expiry.astype(str) != '')
+            parsed_expiry = pd.to_datetime(expiry, format='%Y-%m-%d', errors='coerce')
+            self.parsed_dates['expiry_date'] = parsed_expiry
+            checks.append((present & parsed_expiry.isna(), "Неверный формат даты истечения документа"))
+            not_future = ~(parsed_expiry > pd.Timestamp(today or date.today()))
+            checks.append((present & not_future, "Документ просрочен"))
+
+        return self.collect_errors(df.index, checks)
+
 
 class FlightValidator(DataValidator):
     """Валидатор для данных рейсов"""
@@ -114,7 +207,7 @@ class FlightValidator(DataValidator):
     REQUIRED_FIELDS = ['flight_number', 'departure_airport_code', 'arrival_airport_code',
                        'scheduled_departure', 'scheduled_arrival', 'total_seats']
 
-    def validate_flight_row(self, row: pd.Series) -> Tuple[bool, List[str]]:
+    def validate_flight_row(self, row: Union[pd.Series, Dict[str, Any]]) -> Tuple[bool, List[str]]:
         """Валидация строки с данными рейса"""
         errors = []
 
@@ -154,4 +247,40 @@ class FlightValidator(DataValidator):
         except (ValueError, TypeError):
             errors.append("Неверный формат количества мест")
 
-        return len(errors) == 0, errors
\ No newline at end of file
+        return len(errors) == 0, errors
+
+    def validate_flight_df(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Валидация всего набора данных рейсов по столбцам.
+        Возвращает Series со списком ошибок для каждой строки (пустой список - строка валидна)
+        """
+        checks = [self.missing_fields_check(df, self.REQUIRED_FIELDS)]
+
+        # Валидация кодов аэропортов (3 символа)
+        if 'departure_airport_code' in df:
+            checks.append((df['departure_airport_code'].astype(str).str.len() != 3,
+                           "Код аэропорта вылета должен содержать 3 символа"))
+
+        if 'arrival_airport_code' in df:
+            checks.append((df['arrival_airport_code'].astype(str).str.len() != 3,
+                           "Код аэропорта прилета должен содержать 3 символа"))
+
+        # Валидация дат
+        missing = pd.Series(pd.NaT, index=df.index)
+        departure = df.get('scheduled_departure', missing)
+        arrival = df.get('scheduled_arrival', missing)
+        dep_time = pd.to_datetime(departure, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        arr_time = pd.to_datetime(arrival, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        self.parsed_dates = {'scheduled_departure': dep_time, 'scheduled_arrival': arr_time}
+        checks.append((departure.notna() & dep_time.isna(), "Неверный формат даты вылета"))
+        checks.append((arrival.notna() & arr_time.isna(), "Неверный формат даты прилета"))
+
+        # Проверка что дата прилета после даты вылета (NaT в сравнении дает False)
+        checks.append((arr_time <= dep_time, "Время прилета должно быть после времени вылета"))
+
+        # Валидация количества мест
+        seats = pd.to_numeric(df.get('total_seats', missing), errors='coerce')
+        checks.append((seats.isna(), "Неверный формат количества мест"))
+        checks.append((np.trunc(seats) <= 0, "Количество мест должно быть положительным числом"))
+
+        return self.collect_errors(df.index, checks)
@@ -0,0 +1,25 @@
+import os
+import threading
+import time
+import uuid
+
+# Sequential primary keys. SQL Server orders UNIQUEIDENTIFIER by its last 6 bytes first, then bytes 8-9,
+# so the millisecond timestamp goes into bytes 10-15 and a 14-bit counter into bytes 8-9 (after the
+# variant bits); bytes 0-7 stay random. New keys land at the end of the clustered index, like NEWSEQUENTIALID()
+_id_lock = threading.Lock()
+_last_id_sequence = 0
+
+# Reserves n consecutive (timestamp_ms << 14 | counter) values and returns the first one
+def reserve_id_sequence(n: int = 1) -> int:
+    global _last_id_sequence
+    with _id_lock:
+        start = max(time.time_ns() // 1_000_000 << 14, _last_id_sequence + 1)
+        _last_id_sequence = start + n - 1
+    return start
+
+def sequential_uuid() -> uuid.UUID:
+    sequence = reserve_id_sequence()
+    head = bytearray(os.urandom(8))
+    head[6] = (head[6] & 0x0F) | 0x80  # version 8: custom layout
+    tail = (0x8000 | sequence & 0x3FFF).to_bytes(2, "big") + (sequence >> 14 & 0xFFFFFFFFFFFF).to_bytes(6, "big")
+    return uuid.UUID(bytes=bytes(head) + tail)
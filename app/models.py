@@ -1,8 +1,28 @@
 from sqlalchemy import Column, String, Integer, DateTime, Date, Numeric, SmallInteger, Text, ForeignKey, CheckConstraint
 from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
+from app.ids import sequential_uuid
+from datetime import datetime, timezone
+import os
+
+
+# With DB_RAISE_ON_LAZY_LOAD=1 (tests/dev) any relationship that is not eager-loaded by the query raises
+# instead of issuing a lazy SELECT per object; production keeps lazy loading so a missed option is slow, not a 500
+RELATIONSHIP_LAZY = "raise" if os.getenv("DB_RAISE_ON_LAZY_LOAD") == "1" else "select"
+
+
+# Insert timestamps are set by the application (naive UTC, like GETUTCDATE()), so batched inserts
+# send one value per batch instead of evaluating a server function per row; server defaults stay for
+# rows inserted outside the API/ETL
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def insert_timestamps(model, now: datetime = None) -> dict:
+    now = now or utcnow()
+    return {column.key: now for column in model.__table__.columns
+            if isinstance(column.type, DateTime) and column.default is not None}
 
 
 class Dictionary_BookingStatus(Base):
@@ -13,7 +33,7 @@ class Dictionary_BookingStatus(Base):
     status_name = Column(String(100), nullable=False)
 
     # Relationship
-    bookings = relationship("Booking", back_populates="booking_status")
+    bookings = relationship("Booking", back_populates="booking_status", lazy=RELATIONSHIP_LAZY)
 
 
 class Dictionary_DocumentType(Base):
@@ -24,29 +44,29 @@ class Dictionary_DocumentType(Base):
     type_name = Column(String(100), nullable=False)
 
     # Relationship
-    passenger_documents = relationship("Passenger_Document", back_populates="document_type")
+    passenger_documents = relationship("Passenger_Document", back_populates="document_type", lazy=RELATIONSHIP_LAZY)
 
 
 class Passenger(Base):
     __tablename__ = 'Passenger'
 
-    passenger_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
+    passenger_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     date_of_birth = Column(Date, nullable=False)
     email = Column(String(255))
     phone_number = Column(String(20))
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    documents = relationship("Passenger_Document", back_populates="passenger")
-    tickets = relationship("Ticket", back_populates="passenger")
+    documents = relationship("Passenger_Document", back_populates="passenger", lazy=RELATIONSHIP_LAZY)
+    tickets = relationship("Ticket", back_populates="passenger", lazy=RELATIONSHIP_LAZY)
 
 
 class Flight(Base):
     __tablename__ = 'Flight'
 
-    flight_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
+    flight_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
     flight_number = Column(String(10), nullable=False)
     departure_airport_code = Column(String(3), nullable=False)
     arrival_airport_code = Column(String(3), nullable=False)
@@ -54,10 +74,10 @@ class Flight(Base):
     scheduled_arrival = Column(DateTime, nullable=False)
     aircraft_type = Column(String(50))
     total_seats = Column(SmallInteger, nullable=False)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    fares = relationship("Fare", back_populates="flight")
+    fares = relationship("Fare", back_populates="flight", lazy=RELATIONSHIP_LAZY)
 
     __table_args__ = (
         CheckConstraint('scheduled_arrival > scheduled_departure', name='CHK_Flight_Dates'),
@@ -68,18 +88,18 @@ class Flight(Base):
 class Booking(Base):
     __tablename__ = 'Booking'
 
-    booking_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
-    booking_date = Column(DateTime, nullable=False, server_default=func.getutcdate())
-    booking_status_id = Column(SmallInteger, ForeignKey('Dictionary_BookingStatus.status_id'), nullable=False)
+    booking_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
+    booking_date = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
+    booking_status_id = Column(SmallInteger, ForeignKey('Dictionary_BookingStatus.status_id'), nullable=False, index=True)
     total_amount = Column(Numeric(10, 2), nullable=False)
     contact_email = Column(String(255), nullable=False)
     contact_phone = Column(String(20), nullable=False)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    booking_status = relationship("Dictionary_BookingStatus", back_populates="bookings")
-    tickets = relationship("Ticket", back_populates="booking")
-    payments = relationship("Payment", back_populates="booking")
+    booking_status = relationship("Dictionary_BookingStatus", back_populates="bookings", lazy=RELATIONSHIP_LAZY)
+    tickets = relationship("Ticket", back_populates="booking", lazy=RELATIONSHIP_LAZY)
+    payments = relationship("Payment", back_populates="booking", lazy=RELATIONSHIP_LAZY)
 
     __table_args__ = (
         CheckConstraint('total_amount >= 0', name='CHK_Booking_TotalAmount'),
@@ -89,17 +109,17 @@ class Booking(Base):
 class Fare(Base):
     __tablename__ = 'Fare'
 
-    fare_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
-    flight_id = Column(UNIQUEIDENTIFIER, ForeignKey('Flight.flight_id'), nullable=False)
+    fare_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
+    flight_id = Column(UNIQUEIDENTIFIER, ForeignKey('Flight.flight_id'), nullable=False, index=True)
     fare_class = Column(String(30), nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
     fare_conditions = Column(String(500))
     available_seats = Column(SmallInteger, nullable=False)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    flight = relationship("Flight", back_populates="fares")
-    tickets = relationship("Ticket", back_populates="fare")
+    flight = relationship("Flight", back_populates="fares", lazy=RELATIONSHIP_LAZY)
+    tickets = relationship("Ticket", back_populates="fare", lazy=RELATIONSHIP_LAZY)
 
     __table_args__ = (
         CheckConstraint('price >= 0', name='CHK_Fare_Price'),
@@ -110,53 +130,53 @@ class Fare(Base):
 class Passenger_Document(Base):
     __tablename__ = 'Passenger_Document'
 
-    document_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
-    passenger_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger.passenger_id'), nullable=False)
-    document_type_id = Column(SmallInteger, ForeignKey('Dictionary_DocumentType.document_type_id'), nullable=False)
+    document_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
+    passenger_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger.passenger_id'), nullable=False, index=True)
+    document_type_id = Column(SmallInteger, ForeignKey('Dictionary_DocumentType.document_type_id'), nullable=False, index=True)
     document_number = Column(String(50), nullable=False)
     expiry_date = Column(Date)
     country_of_issue = Column(String(3), nullable=False)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    passenger = relationship("Passenger", back_populates="documents")
-    document_type = relationship("Dictionary_DocumentType", back_populates="passenger_documents")
-    tickets = relationship("Ticket", back_populates="passenger_document")
+    passenger = relationship("Passenger", back_populates="documents", lazy=RELATIONSHIP_LAZY)
+    document_type = relationship("Dictionary_DocumentType", back_populates="passenger_documents", lazy=RELATIONSHIP_LAZY)
+    tickets = relationship("Ticket", back_populates="passenger_document", lazy=RELATIONSHIP_LAZY)
 
 
 class Ticket(Base):
     __tablename__ = 'Ticket'
 
-    ticket_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
-    booking_id = Column(UNIQUEIDENTIFIER, ForeignKey('Booking.booking_id'), nullable=False)
-    passenger_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger.passenger_id'), nullable=False)
-    fare_id = Column(UNIQUEIDENTIFIER, ForeignKey('Fare.fare_id'), nullable=False)
-    passenger_document_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger_Document.document_id'), nullable=False)
+    ticket_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
+    booking_id = Column(UNIQUEIDENTIFIER, ForeignKey('Booking.booking_id'), nullable=False, index=True)
+    passenger_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger.passenger_id'), nullable=False, index=True)
+    fare_id = Column(UNIQUEIDENTIFIER, ForeignKey('Fare.fare_id'), nullable=False, index=True)
+    passenger_document_id = Column(UNIQUEIDENTIFIER, ForeignKey('Passenger_Document.document_id'), nullable=False, index=True)
     seat_number = Column(String(5))
     ticket_number = Column(String(13), nullable=False, unique=True)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    booking = relationship("Booking", back_populates="tickets")
-    passenger = relationship("Passenger", back_populates="tickets")
-    fare = relationship("Fare", back_populates="tickets")
-    passenger_document = relationship("Passenger_Document", back_populates="tickets")
+    booking = relationship("Booking", back_populates="tickets", lazy=RELATIONSHIP_LAZY)
+    passenger = relationship("Passenger", back_populates="tickets", lazy=RELATIONSHIP_LAZY)
+    fare = relationship("Fare", back_populates="tickets", lazy=RELATIONSHIP_LAZY)
+    passenger_document = relationship("Passenger_Document", back_populates="tickets", lazy=RELATIONSHIP_LAZY)
 
 
 class Payment(Base):
     __tablename__ = 'Payment'
 
-    payment_id = Column(UNIQUEIDENTIFIER, primary_key=True, server_default=func.newid())
-    booking_id = Column(UNIQUEIDENTIFIER, ForeignKey('Booking.booking_id'), nullable=False)
+    payment_id = Column(UNIQUEIDENTIFIER, primary_key=True, default=sequential_uuid, server_default=text("NEWSEQUENTIALID()"))
+    booking_id = Column(UNIQUEIDENTIFIER, ForeignKey('Booking.booking_id'), nullable=False, index=True)
     payment_amount = Column(Numeric(10, 2), nullable=False)
-    payment_date = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    payment_date = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
     payment_method = Column(String(50), nullable=False)
     transaction_id = Column(String(100), unique=True)
     payment_status = Column(String(30), nullable=False)
-    created_datetime = Column(DateTime, nullable=False, server_default=func.getutcdate())
+    created_datetime = Column(DateTime, nullable=False, default=utcnow, server_default=func.getutcdate())
 
     # Relationships
-    booking = relationship("Booking", back_populates="payments")
+    booking = relationship("Booking", back_populates="payments", lazy=RELATIONSHIP_LAZY)
 
     __table_args__ = (
         CheckConstraint('payment_amount > 0', name='CHK_Payment_Amount'),
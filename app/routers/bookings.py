@@ -1,40 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, check_known_ids, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Booking, status_code=status.HTTP_201_CREATED)
 def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_booking(db=db, booking=booking)
-    except Exception as e:
-        logger.error(f"Error creating booking: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create booking"
-        )
-
-@router.get("/", response_model=List[schemas.Booking])
-def read_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_bookings(db, skip=skip, limit=limit)
+    check_known_ids(db, [booking.booking_status_id], crud.get_booking_status_ids, "booking status")
+    return crud.create_booking(db=db, booking=booking)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_bookings(items: List[schemas.BookingCreate], db: Session = Depends(get_db)):
+    check_known_ids(db, (item.booking_status_id for item in items), crud.get_booking_status_ids, "booking status")
+    ids = crud.bulk_create_bookings(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Booking]}})
+def read_bookings(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_bookings_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Booking]}})
+def read_bookings_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_bookings_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{booking_id}", response_model=schemas.Booking)
-def read_booking(booking_id: UUID, db: Session = Depends(get_db)):
-    db_booking = crud.get_booking(db, booking_id=booking_id)
-    if db_booking is None:
-        logger.warning(f"Booking with id {booking_id} not found")
-        raise HTTPException(status_code=404, detail="Booking not found")
+def read_booking(booking_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_booking = get_or_404(db, crud.BOOKING_BY_ID, booking_id, "Booking")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Booking, db_booking).model_dump(mode="json"))
+
+@router.get("/{booking_id}/details", response_model=schemas.BookingWithDetails)
+def read_booking_details(booking_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_booking = get_or_404(db, crud.BOOKING_DETAILS_BY_ID, booking_id, "Booking")
     return db_booking
 
 @router.put("/{booking_id}", response_model=schemas.Booking)
 def update_booking(booking_id: UUID, booking: schemas.BookingUpdate, db: Session = Depends(get_db)):
+    check_known_ids(db, [booking.booking_status_id], crud.get_booking_status_ids, "booking status")
     db_booking = crud.update_booking(db, booking_id=booking_id, booking_update=booking)
     if db_booking is None:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -0,0 +1,31 @@
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from typing import Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for limit on list/page endpoints: one request cannot pull a whole table into a single FOR JSON string
+MAX_PAGE_SIZE = 1000
+
+# Runs one of the prebuilt crud.*_BY_ID statements; a missing row becomes a 404
+def get_or_404(db: Session, stmt, pk, name: str):
+    obj = db.execute(stmt, {"pk": pk}).scalar_one_or_none()
+    if obj is None:
+        logger.warning("%s with id %s not found", name, pk)
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return obj
+
+# Rejects FK values missing from a cached dictionary (booking statuses, document types) with a 400.
+# load_known is one of the cached crud.get_*_ids functions; on a miss its cache is dropped and the table
+# re-read once, so rows added to the dictionary are accepted without waiting for the TTL
+def check_known_ids(db: Session, values: Iterable, load_known, name: str):
+    values = {value for value in values if value is not None}
+    if not values:
+        return
+    unknown = values - load_known(db)
+    if unknown:
+        load_known.cache_clear()
+        unknown = values - load_known(db)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(map(str, sorted(unknown)))}")
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from typing import List
 import logging
 
-from app.database import get_db
+from app.database import get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.DocumentType])
-def read_document_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_document_types(db, skip=skip, limit=limit)
\ No newline at end of file
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.DocumentType]}})
+def read_document_types(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_document_types_json(db, skip=skip, limit=limit), media_type="application/json")
\ No newline at end of file
@@ -1,36 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Fare, status_code=status.HTTP_201_CREATED)
 def create_fare(fare: schemas.FareCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_fare(db=db, fare=fare)
-    except Exception as e:
-        logger.error(f"Error creating fare: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create fare"
-        )
-
-@router.get("/", response_model=List[schemas.Fare])
-def read_fares(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_fares(db, skip=skip, limit=limit)
+    return crud.create_fare(db=db, fare=fare)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_fares(items: List[schemas.FareCreate], db: Session = Depends(get_db)):
+    ids = crud.bulk_create_fares(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Fare]}})
+def read_fares(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_fares_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Fare]}})
+def read_fares_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_fares_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{fare_id}", response_model=schemas.Fare)
-def read_fare(fare_id: UUID, db: Session = Depends(get_db)):
-    db_fare = crud.get_fare(db, fare_id=fare_id)
-    if db_fare is None:
-        logger.warning(f"Fare with id {fare_id} not found")
-        raise HTTPException(status_code=404, detail="Fare not found")
+def read_fare(fare_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_fare = get_or_404(db, crud.FARE_BY_ID, fare_id, "Fare")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Fare, db_fare).model_dump(mode="json"))
+
+@router.get("/{fare_id}/details", response_model=schemas.FareWithFlight)
+def read_fare_details(fare_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_fare = get_or_404(db, crud.FARE_DETAILS_BY_ID, fare_id, "Fare")
     return db_fare
 
 @router.put("/{fare_id}", response_model=schemas.Fare)
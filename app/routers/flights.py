@@ -1,36 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Flight, status_code=status.HTTP_201_CREATED)
 def create_flight(flight: schemas.FlightCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_flight(db=db, flight=flight)
-    except Exception as e:
-        logger.error(f"Error creating flight: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create flight"
-        )
-
-@router.get("/", response_model=List[schemas.Flight])
-def read_flights(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_flights(db, skip=skip, limit=limit)
+    return crud.create_flight(db=db, flight=flight)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_flights(items: List[schemas.FlightCreate], db: Session = Depends(get_db)):
+    ids = crud.bulk_create_flights(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Flight]}})
+def read_flights(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_flights_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Flight]}})
+def read_flights_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_flights_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{flight_id}", response_model=schemas.Flight)
-def read_flight(flight_id: UUID, db: Session = Depends(get_db)):
-    db_flight = crud.get_flight(db, flight_id=flight_id)
-    if db_flight is None:
-        logger.warning(f"Flight with id {flight_id} not found")
-        raise HTTPException(status_code=404, detail="Flight not found")
+def read_flight(flight_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_flight = get_or_404(db, crud.FLIGHT_BY_ID, flight_id, "Flight")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Flight, db_flight).model_dump(mode="json"))
+
+@router.get("/{flight_id}/details", response_model=schemas.FlightWithFares)
+def read_flight_details(flight_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_flight = get_or_404(db, crud.FLIGHT_DETAILS_BY_ID, flight_id, "Flight")
     return db_flight
 
 @router.put("/{flight_id}", response_model=schemas.Flight)
@@ -1,40 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, check_known_ids, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.PassengerDocument, status_code=status.HTTP_201_CREATED)
 def create_passenger_document(document: schemas.PassengerDocumentCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_passenger_document(db=db, document=document)
-    except Exception as e:
-        logger.error(f"Error creating passenger document: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create passenger document"
-        )
-
-@router.get("/", response_model=List[schemas.PassengerDocument])
-def read_passenger_documents(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_passenger_documents(db, skip=skip, limit=limit)
+    check_known_ids(db, [document.document_type_id], crud.get_document_type_ids, "document type")
+    return crud.create_passenger_document(db=db, document=document)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_passenger_documents(items: List[schemas.PassengerDocumentCreate], db: Session = Depends(get_db)):
+    check_known_ids(db, (item.document_type_id for item in items), crud.get_document_type_ids, "document type")
+    ids = crud.bulk_create_passenger_documents(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.PassengerDocument]}})
+def read_passenger_documents(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_passenger_documents_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.PassengerDocument]}})
+def read_passenger_documents_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_passenger_documents_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{document_id}", response_model=schemas.PassengerDocument)
-def read_passenger_document(document_id: UUID, db: Session = Depends(get_db)):
-    db_document = crud.get_passenger_document(db, document_id=document_id)
-    if db_document is None:
-        logger.warning(f"Passenger document with id {document_id} not found")
-        raise HTTPException(status_code=404, detail="Passenger document not found")
-    return db_document
+def read_passenger_document(document_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_document = get_or_404(db, crud.PASSENGER_DOCUMENT_BY_ID, document_id, "Passenger document")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.PassengerDocument, db_document).model_dump(mode="json"))
 
 @router.put("/{document_id}", response_model=schemas.PassengerDocument)
 def update_passenger_document(document_id: UUID, document: schemas.PassengerDocumentUpdate, db: Session = Depends(get_db)):
+    check_known_ids(db, [document.document_type_id], crud.get_document_type_ids, "document type")
     db_document = crud.update_passenger_document(db, document_id=document_id, document_update=document)
     if db_document is None:
         raise HTTPException(status_code=404, detail="Passenger document not found")
@@ -1,36 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Passenger, status_code=status.HTTP_201_CREATED)
 def create_passenger(passenger: schemas.PassengerCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_passenger(db=db, passenger=passenger)
-    except Exception as e:
-        logger.error(f"Error creating passenger: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create passenger"
-        )
-
-@router.get("/", response_model=List[schemas.Passenger])
-def read_passengers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_passengers(db, skip=skip, limit=limit)
+    return crud.create_passenger(db=db, passenger=passenger)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_passengers(items: List[schemas.PassengerCreate], db: Session = Depends(get_db)):
+    ids = crud.bulk_create_passengers(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Passenger]}})
+def read_passengers(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_passengers_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Passenger]}})
+def read_passengers_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_passengers_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{passenger_id}", response_model=schemas.Passenger)
-def read_passenger(passenger_id: UUID, db: Session = Depends(get_db)):
-    db_passenger = crud.get_passenger(db, passenger_id=passenger_id)
-    if db_passenger is None:
-        logger.warning(f"Passenger with id {passenger_id} not found")
-        raise HTTPException(status_code=404, detail="Passenger not found")
+def read_passenger(passenger_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_passenger = get_or_404(db, crud.PASSENGER_BY_ID, passenger_id, "Passenger")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Passenger, db_passenger).model_dump(mode="json"))
+
+@router.get("/{passenger_id}/details", response_model=schemas.PassengerWithDocuments)
+def read_passenger_details(passenger_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_passenger = get_or_404(db, crud.PASSENGER_DETAILS_BY_ID, passenger_id, "Passenger")
     return db_passenger
 
 @router.put("/{passenger_id}", response_model=schemas.Passenger)
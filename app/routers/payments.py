@@ -1,37 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Payment, status_code=status.HTTP_201_CREATED)
 def create_payment(payment: schemas.PaymentCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_payment(db=db, payment=payment)
-    except Exception as e:
-        logger.error(f"Error creating payment: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create payment"
-        )
-
-@router.get("/", response_model=List[schemas.Payment])
-def read_payments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_payments(db, skip=skip, limit=limit)
+    return crud.create_payment(db=db, payment=payment)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_payments(items: List[schemas.PaymentCreate], db: Session = Depends(get_db)):
+    ids = crud.bulk_create_payments(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Payment]}})
+def read_payments(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_payments_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Payment]}})
+def read_payments_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_payments_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{payment_id}", response_model=schemas.Payment)
-def read_payment(payment_id: UUID, db: Session = Depends(get_db)):
-    db_payment = crud.get_payment(db, payment_id=payment_id)
-    if db_payment is None:
-        logger.warning(f"Payment with id {payment_id} not found")
-        raise HTTPException(status_code=404, detail="Payment not found")
-    return db_payment
+def read_payment(payment_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_payment = get_or_404(db, crud.PAYMENT_BY_ID, payment_id, "Payment")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Payment, db_payment).model_dump(mode="json"))
 
 @router.put("/{payment_id}", response_model=schemas.Payment)
 def update_payment(payment_id: UUID, payment: schemas.PaymentUpdate, db: Session = Depends(get_db)):
@@ -1,36 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_readonly_db
 from app import crud, schemas
+from app.routers.common import MAX_PAGE_SIZE, get_or_404
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Ticket, status_code=status.HTTP_201_CREATED)
 def create_ticket(ticket: schemas.TicketCreate, db: Session = Depends(get_db)):
-    try:
-        return crud.create_ticket(db=db, ticket=ticket)
-    except Exception as e:
-        logger.error(f"Error creating ticket: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Could not create ticket"
-        )
-
-@router.get("/", response_model=List[schemas.Ticket])
-def read_tickets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return crud.get_tickets(db, skip=skip, limit=limit)
+    return crud.create_ticket(db=db, ticket=ticket)
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_tickets(items: List[schemas.TicketCreate], db: Session = Depends(get_db)):
+    ids = crud.bulk_create_tickets(db=db, items=items)
+    return schemas.BulkCreateResult(created=len(ids), ids=ids)
+
+@router.get("/", response_class=Response, responses={200: {"model": List[schemas.Ticket]}})
+def read_tickets(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), after: Optional[UUID] = None, db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_tickets_json(db, skip=skip, limit=limit, after=after), media_type="application/json")
+
+@router.get("/page", response_class=Response, responses={200: {"model": schemas.Page[schemas.Ticket]}})
+def read_tickets_page(cursor: Optional[UUID] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_readonly_db)):
+    return Response(content=crud.get_tickets_page_json(db, cursor=cursor, limit=limit), media_type="application/json")
 
 @router.get("/{ticket_id}", response_model=schemas.Ticket)
-def read_ticket(ticket_id: UUID, db: Session = Depends(get_db)):
-    db_ticket = crud.get_ticket(db, ticket_id=ticket_id)
-    if db_ticket is None:
-        logger.warning(f"Ticket with id {ticket_id} not found")
-        raise HTTPException(status_code=404, detail="Ticket not found")
+def read_ticket(ticket_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_ticket = get_or_404(db, crud.TICKET_BY_ID, ticket_id, "Ticket")
+    return ORJSONResponse(schemas.construct_from_orm(schemas.Ticket, db_ticket).model_dump(mode="json"))
+
+@router.get("/{ticket_id}/details", response_model=schemas.TicketWithDetails)
+def read_ticket_details(ticket_id: UUID, db: Session = Depends(get_readonly_db)):
+    db_ticket = get_or_404(db, crud.TICKET_DETAILS_BY_ID, ticket_id, "Ticket")
     return db_ticket
 
 @router.put("/{ticket_id}", response_model=schemas.Ticket)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from typing import Generic, Optional, List, TypeVar
 from datetime import datetime, date
+from decimal import Decimal
 from uuid import UUID
 
 # Base schemas
@@ -38,11 +39,11 @@ class FlightBase(BaseModel):
     aircraft_type: Optional[str] = None
     total_seats: int
 
-    @validator('scheduled_arrival')
-    def validate_dates(cls, v, values):
-        if 'scheduled_departure' in values and v <= values['scheduled_departure']:
+    @model_validator(mode='after')
+    def validate_dates(self):
+        if self.scheduled_arrival <= self.scheduled_departure:
             raise ValueError('Arrival date must be after departure date')
-        return v
+        return self
 
 class FlightCreate(FlightBase):
     pass
@@ -98,7 +99,8 @@ class BookingBase(BaseModel):
     contact_email: EmailStr
     contact_phone: str
 
-    @validator('total_amount')
+    @field_validator('total_amount')
+    @classmethod
     def validate_amount(cls, v):
         if v < 0:
             raise ValueError('Total amount cannot be negative')
@@ -129,13 +131,15 @@ class FareBase(BaseModel):
     fare_conditions: Optional[str] = None
     available_seats: int
 
-    @validator('price')
+    @field_validator('price')
+    @classmethod
     def validate_price(cls, v):
         if v < 0:
             raise ValueError('Price cannot be negative')
         return v
 
-    @validator('available_seats')
+    @field_validator('available_seats')
+    @classmethod
     def validate_seats(cls, v):
         if v < 0:
             raise ValueError('Available seats cannot be negative')
@@ -212,7 +216,8 @@ class PaymentBase(BaseModel):
     transaction_id: Optional[str] = None
     payment_status: str
 
-    @validator('payment_amount')
+    @field_validator('payment_amount')
+    @classmethod
     def validate_amount(cls, v):
         if v <= 0:
             raise ValueError('Payment amount must be positive')
@@ -235,6 +240,18 @@ class Payment(PaymentBase):
     class Config:
         from_attributes = True
 
+# Bulk insert result
+class BulkCreateResult(BaseModel):
+    created: int
+    ids: List[UUID]
+
+# Cursor page envelope: pass next_cursor back as ?cursor= to fetch the following page
+ItemT = TypeVar("ItemT")
+
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: Optional[UUID] = None
+
 # Response schemas with relationships
 class PassengerWithDocuments(Passenger):
     documents: List[PassengerDocument] = []
@@ -254,4 +271,14 @@ class TicketWithDetails(Ticket):
     passenger: Optional[Passenger] = None
     booking: Optional[Booking] = None
     fare: Optional[Fare] = None
-    passenger_document: Optional[PassengerDocument] = None
\ No newline at end of file
+    passenger_document: Optional[PassengerDocument] = None
+
+# Rows loaded from the database already satisfy the column types: build the response model without
+# running field validation, only the serializer does any work.
+# Numeric columns come back as Decimal and are converted to the float the schemas declare
+def construct_from_orm(schema, obj):
+    values = {}
+    for name in schema.model_fields:
+        value = getattr(obj, name)
+        values[name] = float(value) if isinstance(value, Decimal) else value
+    return schema.model_construct(**values)
@@ -12,7 +12,7 @@ class ETLConfig:
     ERRORS_DIR: str = "data/errors"
 
     # Настройки обработки
-    CHUNK_SIZE: int = 1000
+    CHUNK_SIZE: int = 50_000  # Строк в одной порции при потоковой обработке файла
     MAX_ERRORS: int = 100
 
     # Маппинги для трансформации
@@ -51,6 +51,11 @@ class ETLConfig:
                 'BUS': 'BUSINESS'
             }
 
+        # Коды в данных приводятся к верхнему регистру, поэтому и ключи маппингов нормализуются один раз здесь
+        self.DOCUMENT_TYPE_MAPPING = {k.upper(): v for k, v in self.DOCUMENT_TYPE_MAPPING.items()}
+        self.BOOKING_STATUS_MAPPING = {k.upper(): v for k, v in self.BOOKING_STATUS_MAPPING.items()}
+        self.FARE_CLASS_MAPPING = {k.upper(): v for k, v in self.FARE_CLASS_MAPPING.items()}
+
     def ensure_directories(self):
         """Создает необходимые директории"""
         for directory in [self.INPUT_DIR, self.OUTPUT_DIR, self.PROCESSED_DIR, self.ERRORS_DIR]:
@@ -1,154 +1,293 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.concurrency import run_in_threadpool
+from anyio import to_thread
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 import logging
+import multiprocessing
+import orjson
 import uvicorn
 import os
+import shutil
+import threading
+import time
 import uuid
-from typing import Dict, Any
+from datetime import datetime, timezone
 
-from app.database import engine, get_db, SessionLocal
-from app import models
+from app.database import engine, get_readonly_db, SessionLocal, DB_POOL_SIZE, DB_MAX_OVERFLOW
+from app import crud, models
+from app.etl import run_file_task
 from app.routers import (
     passengers, flights, bookings, fares,
     passenger_documents, tickets, payments,
     booking_statuses, document_types
 )
-from app.etl import ETLOrchestrator
 
 # Настройка логгера для main.py
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Tables are created on startup only when RUN_CREATE_ALL is set; otherwise every worker boot would
+# check each table in the database catalog
+RUN_CREATE_ALL = os.getenv("RUN_CREATE_ALL", "").lower() in ("1", "true", "yes")
+
+# Sync endpoints run in anyio's worker threads (40 by default). The limit must not be below the
+# connection pool size, otherwise the pool can never be used in full
+THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", str(max(40, DB_POOL_SIZE + DB_MAX_OVERFLOW))))
+
+# Загрузки пишутся на диск частями по 1 МБ, файл целиком в память не читается.
+# Каталог совпадает с etl_config.INPUT_DIR: экстракторы ETL ищут файлы относительно него
+UPLOAD_DIR = "data/input"
+UPLOAD_CHUNK_SIZE = 1 << 20
+ALLOWED_EXTENSIONS = frozenset(("csv", "xlsx", "xls"))
+UNSUPPORTED_FORMAT_DETAIL = "Неподдерживаемый формат файла. Разрешены: .csv, .xlsx, .xls"
+
+# ETL загруженных файлов выполняется в отдельном пуле процессов: не занимает потоки API и
+# ограничивает число одновременных задач (остальные ждут в очереди пула)
+ETL_WORKERS = int(os.getenv("ETL_WORKERS", str(os.cpu_count() or 1)))
+ETL_FILE_KINDS = frozenset(("passengers", "flights"))
+ETL_FILE_TOKENS = (("passenger", "passengers"), ("flight", "flights"))
+# При ENABLE_ETL=0 эндпоинты /api/etl/* не регистрируются и пул ETL не создается
+ENABLE_ETL = os.getenv("ENABLE_ETL", "1") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if ENABLE_ETL:
+        # Каталог загрузок создается один раз при старте; если он недоступен для записи,
+        # приложение не стартует, а не падает на первой загрузке
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        if not os.access(UPLOAD_DIR, os.W_OK):
+            raise RuntimeError(f"Upload directory {UPLOAD_DIR} is not writable")
+        mp_context = multiprocessing.get_context("spawn")
+        app.state.etl_pool = ProcessPoolExecutor(max_workers=ETL_WORKERS, mp_context=mp_context)
+        # Файлы рейсов обновляют общие рейсы и тарифы (поиск существующих по номеру и времени вылета),
+        # поэтому обрабатываются по одному в своем пуле; файлы пассажиров независимы
+        app.state.etl_flights_pool = ProcessPoolExecutor(max_workers=1, mp_context=mp_context)
+    if RUN_CREATE_ALL:
+        models.Base.metadata.create_all(bind=engine)
+    # Dictionary tables are loaded once at startup into the crud TTL caches; a failure here
+    # only means the first request loads them
+    db = SessionLocal()
+    try:
+        crud.get_booking_status_ids(db)
+        crud.get_document_type_ids(db)
+        crud.get_booking_statuses_json(db)
+        crud.get_document_types_json(db)
+    except Exception as e:
+        logger.warning("Could not prefetch dictionary tables: %s", e)
+    finally:
+        db.close()
+    yield
+    # Запущенные задачи дорабатывают, еще не начатые отменяются
+    if ENABLE_ETL:
+        app.state.etl_pool.shutdown(wait=True, cancel_futures=True)
+        app.state.etl_flights_pool.shutdown(wait=True, cancel_futures=True)
+
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="AviaSales API",
     description="REST API for AviaSales booking system with ETL capabilities",
-    version="2.0.0"
+    version="2.0.0",
+    # response bodies are encoded with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware
+# CORS middleware: origins come from CORS_ORIGINS (comma-separated). Credentials are never combined
+# with the "*" wildcard, so the middleware sends a constant Allow-Origin header instead of echoing the request
+CORS_ORIGINS = tuple(origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip())
+CORS_ALLOW_CREDENTIALS = os.getenv("CORS_ALLOW_CREDENTIALS") == "1" and "*" not in CORS_ORIGINS
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=CORS_ALLOW_CREDENTIALS,
+    allow_methods=("GET", "POST", "PUT", "DELETE"),
+    allow_headers=("authorization", "content-type"),
 )
 
+# Constraint violations (FK, UNIQUE, CHECK) from any write endpoint are client errors
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    logger.warning("Integrity error on %s %s: %s", request.method, request.url.path, exc.orig)
+    return ORJSONResponse(status_code=400, content={"detail": "Could not save record: constraint violation"})
+
 # Include routers
-app.include_router(passengers.router, prefix="/api/passengers", tags=["passengers"])
-app.include_router(flights.router, prefix="/api/flights", tags=["flights"])
-app.include_router(bookings.router, prefix="/api/bookings", tags=["bookings"])
-app.include_router(fares.router, prefix="/api/fares", tags=["fares"])
-app.include_router(passenger_documents.router, prefix="/api/passenger-documents", tags=["passenger-documents"])
-app.include_router(tickets.router, prefix="/api/tickets", tags=["tickets"])
-app.include_router(payments.router, prefix="/api/payments", tags=["payments"])
-app.include_router(booking_statuses.router, prefix="/api/booking-statuses", tags=["booking-statuses"])
-app.include_router(document_types.router, prefix="/api/document-types", tags=["document-types"])
-
-
-# Root endpoint
+ROUTERS = (
+    (passengers, "passengers"),
+    (flights, "flights"),
+    (bookings, "bookings"),
+    (fares, "fares"),
+    (passenger_documents, "passenger-documents"),
+    (tickets, "tickets"),
+    (payments, "payments"),
+    (booking_statuses, "booking-statuses"),
+    (document_types, "document-types"),
+)
+for module, name in ROUTERS:
+    app.include_router(module.router, prefix=f"/api/{name}", tags=[name])
+
+
+# A response built once and returned from every request. Middleware (CORS) edits the header list of
+# the start message in place, so each send gets a copy of it instead of the shared raw_headers
+class StaticResponse(Response):
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": list(self.raw_headers)})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+# Static responses, serialized once at import
+ROOT_RESPONSE = StaticResponse(orjson.dumps({
+    "message": "AviaSales API with ETL",
+    "version": "2.0.0",
+    "docs": "/docs",
+    "redoc": "/redoc"
+}), media_type="application/json")
+HEALTHY_RESPONSE = StaticResponse(orjson.dumps({
+    "status": "healthy",
+    "database": "connected"
+}), media_type="application/json")
+
+
+# Root endpoint: no I/O, so it stays async and is served on the event loop without a threadpool hop
 @app.get("/")
 async def root():
-    return {
-        "message": "AviaSales API with ETL",
-        "version": "2.0.0",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return ROOT_RESPONSE
+
+
+# Health check endpoint: the DB call is blocking, so it runs as a sync endpoint in the threadpool.
+# The probe statement is built once and runs on an autocommit read-only session (no ROLLBACK afterwards)
+HEALTH_CHECK_SQL = text('SELECT 1')
 
 
-# Health check endpoint
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_readonly_db)):
     try:
         # Try to execute a simple query to check database connection
-        db.execute(text('SELECT 1'))
-        return {
-            "status": "healthy",
-            "database": "connected"
-        }
+        db.execute(HEALTH_CHECK_SQL)
+        return HEALTHY_RESPONSE
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
         raise HTTPException(status_code=503, detail="Database connection failed")
 
 
 # ETL endpoints
-@app.post("/api/etl/upload-file")
+etl_router = APIRouter(prefix="/api/etl")
+
+
+@etl_router.post("/upload-file")
 async def upload_file(
-        background_tasks: BackgroundTasks,
         file: UploadFile = File(...),
         file_type: str = "auto"
 ):
     """Эндпоинт для загрузки файла и запуска ETL"""
     try:
         # Проверяем расширение файла
-        allowed_extensions = ['.csv', '.xlsx', '.xls']
-        file_extension = os.path.splitext(file.filename)[1].lower()
+        _, dot, file_extension = file.filename.rpartition(".")
 
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Неподдерживаемый формат файла. Разрешены: {', '.join(allowed_extensions)}"
-            )
+        if not dot or file_extension.lower() not in ALLOWED_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=UNSUPPORTED_FORMAT_DETAIL)
 
-        # Создаем директорию input если не существует
-        os.makedirs("data/input", exist_ok=True)
+        # Сохраняем файл потоково: копирование блоками по UPLOAD_CHUNK_SIZE целиком выполняется
+        # в одном потоке пула и не блокирует event loop
+        # Из имени берется только последний компонент, чтобы путь клиента не вывел запись за UPLOAD_DIR
+        file_id = uuid.uuid4().hex
+        file_name = f"{file_id}_{os.path.basename(file.filename)}"
 
-        # Сохраняем файл
-        file_id = str(uuid.uuid4())
-        file_path = os.path.join("data/input", f"{file_id}_{file.filename}")
+        await run_in_threadpool(_save_upload, file.file, f"{UPLOAD_DIR}/{file_name}")
 
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Ставим файл в очередь ETL-пула; ETL получает имя относительно UPLOAD_DIR
+        process_uploaded_file(file_name, file_type)
 
-        # Запускаем ETL в фоне
-        background_tasks.add_task(process_uploaded_file, file_path, file_type)
-
-        return {
+        # Ответ собирается из строк, поэтому возвращается готовым ORJSONResponse без прохода jsonable_encoder
+        return ORJSONResponse({
             "message": "Файл загружен и находится в обработке",
             "file_id": file_id,
             "filename": file.filename
-        }
+        })
 
     except Exception as e:
-        logger.error(f"Ошибка загрузки файла: {str(e)}")
+        logger.error("Ошибка загрузки файла: %s", e)
         raise HTTPException(status_code=500, detail=f"Ошибка загрузки файла: {str(e)}")
 
 
-@app.get("/api/etl/status")
+# Счетчики задач ETL-пула; done-callback вызывается в служебном потоке пула, поэтому под блокировкой
+_etl_jobs_lock = threading.Lock()
+_etl_jobs = {"active": 0, "last_finished": None}
+
+# Ответ /api/etl/status пересобирается не чаще раза в ETL_STATUS_TTL секунд,
+# частые опросы дашбордов получают один и тот же готовый объект ответа
+ETL_STATUS_TTL = 1.0
+_etl_status_cache = {"ts": float("-inf"), "response": None}
+
+
+def _etl_status_response() -> StaticResponse:
+    now = time.monotonic()
+    if now - _etl_status_cache["ts"] > ETL_STATUS_TTL:
+        with _etl_jobs_lock:
+            jobs = dict(_etl_jobs)
+        _etl_status_cache["response"] = StaticResponse(orjson.dumps({
+            "status": "running",
+            "message": "ETL system is operational",
+            "active_jobs": jobs["active"],
+            "last_finished": jobs["last_finished"]
+        }), media_type="application/json")
+        _etl_status_cache["ts"] = now
+    return _etl_status_cache["response"]
+
+
+@etl_router.get("/status")
 async def get_etl_status():
     """Получить статус ETL-процессов"""
-    return {"status": "running", "message": "ETL system is operational"}
+    return _etl_status_response()
 
 
-def process_uploaded_file(file_path: str, file_type: str):
-    """Фоновая задача обработки файла"""
-    db = SessionLocal()
-    try:
-        orchestrator = ETLOrchestrator(db)
-
-        if file_type == "passengers" or "passenger" in file_path.lower():
-            orchestrator.process_passengers_file(file_path)
-        elif file_type == "flights" or "flight" in file_path.lower():
-            orchestrator.process_flights_file(file_path)
-        else:
-            # Автоопределение
-            if "passenger" in file_path.lower():
-                orchestrator.process_passengers_file(file_path)
-            elif "flight" in file_path.lower():
-                orchestrator.process_flights_file(file_path)
+def _save_upload(source, file_path: str):
+    with open(file_path, "wb") as out:
+        shutil.copyfileobj(source, out, UPLOAD_CHUNK_SIZE)
 
-    except Exception as e:
-        # Используем логгер, объявленный в начале файла
-        logger.error(f"Ошибка обработки файла {file_path}: {str(e)}")
-    finally:
-        db.close()
+
+def process_uploaded_file(file_name: str, file_type: str):
+    """Постановка загруженного файла (имя относительно UPLOAD_DIR) в очередь ETL-пула"""
+    # Явно указанный тип важнее имени файла; иначе тип определяется по подстроке в имени
+    if file_type in ETL_FILE_KINDS:
+        kind = file_type
+    else:
+        lowered_name = file_name.lower()
+        kind = next((kind for token, kind in ETL_FILE_TOKENS if token in lowered_name), None)
+    if kind is None:
+        logger.warning("Не удалось определить тип файла %s, обработка пропущена", file_name)
+        return
+
+    # ETL (pandas) подгружается только в процессах пула, в процесс API не импортируется
+    pool = app.state.etl_flights_pool if kind == "flights" else app.state.etl_pool
+    future = pool.submit(run_file_task, kind, file_name)
+    with _etl_jobs_lock:
+        _etl_jobs["active"] += 1
+    future.add_done_callback(lambda done: _log_etl_result(file_name, done))
+
+
+def _log_etl_result(file_name: str, future: Future):
+    with _etl_jobs_lock:
+        _etl_jobs["active"] -= 1
+        _etl_jobs["last_finished"] = datetime.now(timezone.utc)
+    if future.cancelled():
+        logger.warning("Обработка файла %s отменена", file_name)
+    elif future.exception() is not None:
+        logger.error("Ошибка обработки файла %s: %s", file_name, future.exception())
+    else:
+        logger.info("Файл обработан: %s", file_name)
+
+
+if ENABLE_ETL:
+    app.include_router(etl_router)
 
 
 if __name__ == "__main__":
@@ -156,6 +295,10 @@ if __name__ == "__main__":
         "main:app",
         host="127.0.0.1",
         port=8000,
-        reload=True,
-        log_level="info"
+        # Перезагрузчик следит за всеми файлами проекта, поэтому включается только для разработки
+        reload=os.getenv("DEBUG") == "1",
+        log_level="info",
+        # "auto" выбирает uvloop, если он установлен (на Windows его нет, там остается asyncio)
+        loop="auto",
+        http="httptools"
     )
\ No newline at end of file